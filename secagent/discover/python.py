@@ -3,24 +3,142 @@ Python framework discovery (FastAPI, Flask, Django, DRF).
 """
 
 import ast
+import hashlib
+import json
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from rich.console import Console
 
 console = Console()
 
+# Split a requirement line at the first version/extras specifier character
+_DEP_SPLIT = re.compile(r'[\s=<>!~;\[]')
+
+# Regexes that are only run after a cheap substring prefilter confirms the
+# fixed literal is present at all
+_DEBUG_RE = re.compile(r'DEBUG\s*=\s*True')
+_CORS_RE = re.compile(r'CORS_ALLOW_ALL_ORIGINS\s*=\s*True')
+_DEPENDS_RE = re.compile(r'Depends\s*\(')
+_SECURITY_RE = re.compile(r'Security\s*\(')
+
+# Dependency name -> framework it implies
+_FRAMEWORK_MAP = {
+    "fastapi": "fastapi",
+    "uvicorn": "fastapi",
+    "flask": "flask",
+    "django": "django",
+    "djangorestframework": "drf",
+    "drf": "drf",
+}
+
+class _RouteVisitor(ast.NodeVisitor):
+    """Collects framework route definitions in a single walk of a parsed module."""
+
+    HTTP_METHODS = {'get', 'post', 'put', 'patch', 'delete', 'head', 'options'}
+    FASTAPI_OBJECTS = {'app', 'router'}
+    FLASK_OBJECTS = {'app', 'bp', 'blueprint'}
+    DJANGO_URL_FUNCS = {'path', 'url', 're_path'}
+    DRF_ACTIONS = {'list', 'create', 'retrieve', 'update', 'partial_update', 'destroy'}
+
+    def __init__(self):
+        self.fastapi_routes = []  # (method, path)
+        self.flask_routes = []    # (path, [methods])
+        self.django_routes = []   # (path, view_name)
+        self.drf_views = []       # (class_name, [method_names])
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._check_decorators(node)
+        self.generic_visit(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._check_decorators(node)
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        base_names = [self._name_of(base) for base in node.bases]
+        if any(name and ("ViewSet" in name or "APIView" in name) for name in base_names):
+            methods = [
+                item.name for item in node.body
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+                and (item.name in self.HTTP_METHODS or item.name in self.DRF_ACTIONS)
+            ]
+            self.drf_views.append((node.name, methods))
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        # Django URL configuration: path('...', view), url(r'...', view), re_path(...)
+        func_name = self._name_of(node.func)
+        if func_name in self.DJANGO_URL_FUNCS and node.args:
+            url_path = self._const_str(node.args[0])
+            if url_path is not None and len(node.args) > 1:
+                view_name = self._name_of(node.args[1])
+                if view_name:
+                    self.django_routes.append((url_path, view_name))
+        self.generic_visit(node)
+
+    def _check_decorators(self, node) -> None:
+        """Inspect decorators for FastAPI/Flask route registrations."""
+        for deco in node.decorator_list:
+            if not isinstance(deco, ast.Call) or not isinstance(deco.func, ast.Attribute):
+                continue
+
+            obj = deco.func.value
+            obj_name = obj.id if isinstance(obj, ast.Name) else None
+            attr = deco.func.attr
+            route_path = self._const_str(deco.args[0]) if deco.args else None
+
+            if route_path is None:
+                continue
+
+            # FastAPI: @app.get("/path"), @router.post("/path")
+            if attr in self.HTTP_METHODS and obj_name in self.FASTAPI_OBJECTS:
+                self.fastapi_routes.append((attr.upper(), route_path))
+
+            # Flask: @app.route("/path", methods=["GET", "POST"])
+            elif attr == 'route' and obj_name in self.FLASK_OBJECTS:
+                methods = self._methods_keyword(deco) or ["GET"]
+                self.flask_routes.append((route_path, methods))
+
+    @staticmethod
+    def _name_of(node) -> Optional[str]:
+        """Extract a dotted name's final identifier from an expression node."""
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Attribute):
+            return node.attr
+        return None
+
+    @staticmethod
+    def _const_str(node) -> Optional[str]:
+        """Return the value of a string constant node, if it is one."""
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        return None
+
+    @classmethod
+    def _methods_keyword(cls, call: ast.Call) -> Optional[list]:
+        """Extract methods=[...] from a Flask route decorator call."""
+        for keyword in call.keywords:
+            if keyword.arg == 'methods' and isinstance(keyword.value, (ast.List, ast.Tuple)):
+                methods = [cls._const_str(elt) for elt in keyword.value.elts]
+                return [m.upper() for m in methods if m]
+        return None
+
 class PythonDiscovery:
     """Discovers Python API endpoints from various frameworks."""
-    
+
     def __init__(self, repo_path: Path, verbose: bool = False):
         self.repo_path = repo_path
         self.verbose = verbose
-    
+        self.cache_dir = repo_path / ".secagent-cache" / "ast" if repo_path else None
+
     def discover(self) -> Dict[str, Any]:
         """
         Discover Python endpoints from framework patterns.
-        
+
         Returns:
             Dictionary with discovered endpoints and security findings
         """
@@ -30,7 +148,7 @@ class PythonDiscovery:
             "technologies": [],
             "requirements": {}
         }
-        
+
         # Analyze requirements for framework detection
         requirements_files = ["requirements.txt", "pyproject.toml", "setup.py", "Pipfile"]
         for req_file in requirements_files:
@@ -38,33 +156,142 @@ class PythonDiscovery:
             if req_path.exists():
                 results["requirements"][req_file] = self._analyze_requirements(req_path)
                 results["technologies"].extend(results["requirements"][req_file].get("frameworks", []))
-        
-        # Find Python files
-        py_files = list(self.repo_path.glob("**/*.py"))
-        py_files = [f for f in py_files if "__pycache__" not in str(f) and ".git" not in str(f)]
-        
-        for py_file in py_files:
-            try:
-                file_content = self._read_file(py_file)
-                if file_content:
-                    # Discover endpoints from different frameworks
-                    endpoints = []
-                    endpoints.extend(self._discover_fastapi_routes(file_content, py_file))
-                    endpoints.extend(self._discover_flask_routes(file_content, py_file))
-                    endpoints.extend(self._discover_django_routes(file_content, py_file))
-                    endpoints.extend(self._discover_drf_routes(file_content, py_file))
-                    
-                    results["endpoints"].extend(endpoints)
-                    
-                    # Security analysis
-                    security_findings = self._analyze_security_patterns(file_content, py_file)
-                    results["security_findings"].extend(security_findings)
-                    
-            except Exception as e:
-                if self.verbose:
-                    console.print(f"   ⚠️  Could not analyze {py_file}: {e}", style="yellow")
-        
+
+        # Find Python files - keep this lazy so huge monorepos don't pay for
+        # a fully materialized Path list before any work starts
+        py_files = (
+            f for f in self.repo_path.glob("**/*.py")
+            if "__pycache__" not in str(f) and ".git" not in str(f)
+        )
+
+        # Reads are I/O-bound and release the GIL, so overlap them with the
+        # CPU-side analysis of files that have already arrived
+        with ThreadPoolExecutor(max_workers=16) as io_pool:
+            futures = {io_pool.submit(self._read_file, f): f for f in py_files}
+
+            for future in as_completed(futures):
+                py_file = futures[future]
+                try:
+                    file_content = future.result()
+                    if file_content:
+                        endpoints, security_findings = self._analyze_one_file_cached(file_content, py_file)
+                        results["endpoints"].extend(endpoints)
+                        results["security_findings"].extend(security_findings)
+
+                except Exception as e:
+                    if self.verbose:
+                        console.print(f"   ⚠️  Could not analyze {py_file}: {e}", style="yellow")
+
         return results
+
+    def _analyze_one_file_cached(self, content: str, file_path: Path) -> tuple:
+        """Analyze a file, reusing cached results for unchanged content."""
+        if self.cache_dir is None:
+            return self._analyze_one_file(content, file_path)
+
+        # The cached payload embeds path attributions (source_file, finding
+        # locations), so the key must cover the path as well as the content:
+        # identical files must not share an entry, and a moved file must not
+        # keep reporting its old location. Relative to the repo root so the
+        # cache survives checkouts at different absolute paths.
+        try:
+            rel_path = file_path.relative_to(self.repo_path).as_posix()
+        except ValueError:
+            rel_path = str(file_path)
+        hasher = hashlib.sha256(rel_path.encode('utf-8'))
+        hasher.update(b'\0')
+        hasher.update(content.encode('utf-8'))
+        cache_file = self.cache_dir / f"{hasher.hexdigest()}.json"
+
+        if cache_file.exists():
+            try:
+                cached = json.loads(cache_file.read_text(encoding='utf-8'))
+                return cached["endpoints"], cached["security_findings"]
+            except Exception:
+                pass  # Corrupt cache entry - re-analyze
+
+        endpoints, security_findings = self._analyze_one_file(content, file_path)
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(
+                json.dumps({"endpoints": endpoints, "security_findings": security_findings}),
+                encoding='utf-8'
+            )
+        except Exception:
+            pass  # Cache writes are best-effort
+
+        return endpoints, security_findings
+
+    def _analyze_one_file(self, content: str, file_path: Path) -> tuple:
+        """Analyze a single Python file for endpoints and security findings."""
+        endpoints = []
+
+        # Cheap marker prescreen: most files in a repo define no routes at
+        # all, so skip the parse entirely when no framework marker is present
+        may_have_routes = (
+            '@app.' in content or '@router.' in content or '.route(' in content
+            or 'urlpatterns' in content or 'ViewSet' in content or 'APIView' in content
+        )
+
+        # One AST parse + walk replaces the per-framework regex sweeps, and
+        # ignores route-like text inside strings and comments
+        tree = None
+        if may_have_routes:
+            try:
+                tree = ast.parse(content)
+            except SyntaxError:
+                pass
+
+        if tree is not None:
+            visitor = _RouteVisitor()
+            visitor.visit(tree)
+
+            # File-level facts are the same for every endpoint in the file, so
+            # scan the content once instead of once per endpoint
+            facts = self._compute_file_facts(content)
+
+            endpoints.extend(self._discover_fastapi_routes(visitor.fastapi_routes, facts, file_path))
+            endpoints.extend(self._discover_flask_routes(visitor.flask_routes, facts, file_path))
+            if "urlpatterns" in content:
+                endpoints.extend(self._discover_django_routes(visitor.django_routes, facts, file_path))
+            endpoints.extend(self._discover_drf_routes(visitor.drf_views, facts, file_path))
+
+        # Dedupe as we go so repeated registrations (e.g. a decorator matched
+        # for both a ViewSet action and an HTTP-verb method) don't produce
+        # duplicate dicts for later stages to churn through
+        seen = set()
+        unique_endpoints = []
+        for endpoint in endpoints:
+            key = (endpoint["method"], endpoint["path"], endpoint["source"], endpoint.get("view_class"))
+            if key not in seen:
+                seen.add(key)
+                unique_endpoints.append(endpoint)
+
+        security_findings = self._analyze_security_patterns(content, file_path)
+
+        return unique_endpoints, security_findings
+
+    def _compute_file_facts(self, content: str) -> Dict[str, Any]:
+        """Compute per-file facts shared by every endpoint found in the file."""
+        # Plain substring checks use CPython's fast memchr-backed search; the
+        # two regexes only run when their literal prefix is present
+        has_auth = (
+            '@login_required' in content
+            or '@auth' in content
+            or '@jwt_required' in content
+            or 'permission_classes' in content
+            or 'IsAuthenticated' in content
+            or ('Depends' in content and _DEPENDS_RE.search(content) is not None)
+            or ('Security' in content and _SECURITY_RE.search(content) is not None)
+        )
+
+        return {
+            "has_auth": has_auth,
+            "fastapi_dependencies": self._extract_fastapi_dependencies(content),
+            "flask_decorators": self._extract_flask_decorators(content),
+            "drf_permissions": self._extract_drf_permissions(content),
+        }
     
     def _analyze_requirements(self, req_file: Path) -> Dict[str, Any]:
         """Analyze requirements file for framework information."""
@@ -74,21 +301,15 @@ class PythonDiscovery:
             dependencies = []
             
             if req_file.name == "requirements.txt":
-                lines = content.split('\n')
-                for line in lines:
+                for line in content.splitlines():
                     line = line.strip()
                     if line and not line.startswith('#'):
-                        dep = line.split('==')[0].split('>=')[0].split('<=')[0].strip()
+                        dep = _DEP_SPLIT.split(line, 1)[0]
                         dependencies.append(dep)
-                        
-                        if dep.lower() in ["fastapi", "uvicorn"]:
-                            frameworks.append("fastapi")
-                        elif dep.lower() in ["flask"]:
-                            frameworks.append("flask")
-                        elif dep.lower() in ["django"]:
-                            frameworks.append("django")
-                        elif dep.lower() in ["djangorestframework", "drf"]:
-                            frameworks.append("drf")
+
+                        framework = _FRAMEWORK_MAP.get(dep.lower())
+                        if framework:
+                            frameworks.append(framework)
             
             elif req_file.name == "pyproject.toml":
                 # Basic TOML parsing for dependencies
@@ -117,156 +338,100 @@ class PythonDiscovery:
         except Exception:
             return ""
     
-    def _discover_fastapi_routes(self, content: str, file_path: Path) -> List[Dict[str, Any]]:
-        """Discover FastAPI routes."""
+    def _discover_fastapi_routes(self, routes: List[tuple], facts: Dict[str, Any],
+                                file_path: Path) -> List[Dict[str, Any]]:
+        """Build endpoint dicts from discovered FastAPI routes."""
         endpoints = []
-        
-        # FastAPI route patterns
-        patterns = [
-            r'@app\.(?P<method>get|post|put|patch|delete|head|options)\s*\(\s*[\'"`](?P<path>[^\'"`]+)[\'"`]',
-            r'@router\.(?P<method>get|post|put|patch|delete|head|options)\s*\(\s*[\'"`](?P<path>[^\'"`]+)[\'"`]',
-            r'app\.(?P<method>get|post|put|patch|delete|head|options)\s*\(\s*[\'"`](?P<path>[^\'"`]+)[\'"`]',
-            r'router\.(?P<method>get|post|put|patch|delete|head|options)\s*\(\s*[\'"`](?P<path>[^\'"`]+)[\'"`]'
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                method = match.group('method').upper()
-                path = match.group('path')
-                
+        src_file = sys.intern(str(file_path))
+
+        for method, path in routes:
+            endpoint = {
+                "method": sys.intern(method),
+                "path": path,
+                "source": "fastapi",
+                "source_file": src_file,
+                "parameters": self._extract_fastapi_params(path),
+                "auth_requirements": facts["fastapi_dependencies"],
+                "security_hints": self._analyze_endpoint_patterns(method, path, facts)
+            }
+
+            endpoints.append(endpoint)
+
+        return endpoints
+
+    def _discover_flask_routes(self, routes: List[tuple], facts: Dict[str, Any],
+                              file_path: Path) -> List[Dict[str, Any]]:
+        """Build endpoint dicts from discovered Flask routes."""
+        endpoints = []
+        src_file = sys.intern(str(file_path))
+
+        for path, methods in routes:
+            for method in methods:
                 endpoint = {
-                    "method": method,
+                    "method": sys.intern(method),
                     "path": path,
-                    "source": "fastapi",
-                    "source_file": str(file_path),
-                    "parameters": self._extract_fastapi_params(path, content),
-                    "auth_requirements": self._extract_fastapi_dependencies(content),
-                    "security_hints": self._analyze_endpoint_patterns(method, path, content)
+                    "source": "flask",
+                    "source_file": src_file,
+                    "parameters": self._extract_flask_params(path),
+                    "auth_requirements": facts["flask_decorators"],
+                    "security_hints": self._analyze_endpoint_patterns(method, path, facts)
                 }
-                
+
                 endpoints.append(endpoint)
-        
-        return endpoints
-    
-    def _discover_flask_routes(self, content: str, file_path: Path) -> List[Dict[str, Any]]:
-        """Discover Flask routes."""
-        endpoints = []
-        
-        # Flask route patterns
-        patterns = [
-            r'@app\.route\s*\(\s*[\'"`](?P<path>[^\'"`]+)[\'"`](?:.*methods\s*=\s*\[([^\]]+)\])?',
-            r'@bp\.route\s*\(\s*[\'"`](?P<path>[^\'"`]+)[\'"`](?:.*methods\s*=\s*\[([^\]]+)\])?',
-            r'@blueprint\.route\s*\(\s*[\'"`](?P<path>[^\'"`]+)[\'"`](?:.*methods\s*=\s*\[([^\]]+)\])?'
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                path = match.group('path')
-                methods_str = match.group(2) if len(match.groups()) > 1 and match.group(2) else "GET"
-                
-                # Parse methods
-                methods = []
-                if methods_str:
-                    methods = [m.strip().strip('\'"').upper() for m in methods_str.split(',')]
-                else:
-                    methods = ["GET"]
-                
-                for method in methods:
-                    endpoint = {
-                        "method": method,
-                        "path": path,
-                        "source": "flask",
-                        "source_file": str(file_path),
-                        "parameters": self._extract_flask_params(path),
-                        "auth_requirements": self._extract_flask_decorators(content),
-                        "security_hints": self._analyze_endpoint_patterns(method, path, content)
-                    }
-                    
-                    endpoints.append(endpoint)
-        
+
         return endpoints
-    
-    def _discover_django_routes(self, content: str, file_path: Path) -> List[Dict[str, Any]]:
-        """Discover Django URL patterns."""
+
+    def _discover_django_routes(self, routes: List[tuple], facts: Dict[str, Any],
+                               file_path: Path) -> List[Dict[str, Any]]:
+        """Build endpoint dicts from discovered Django URL patterns."""
         endpoints = []
-        
-        # Django URL patterns
-        if "urlpatterns" in content:
-            # Basic pattern matching for Django URLs
-            url_patterns = [
-                r'path\s*\(\s*[\'"`]([^\'"`]+)[\'"`]\s*,\s*(\w+)',
-                r'url\s*\(\s*r?[\'"`]([^\'"`]+)[\'"`]\s*,\s*(\w+)',
-                r're_path\s*\(\s*r?[\'"`]([^\'"`]+)[\'"`]\s*,\s*(\w+)'
-            ]
-            
-            for pattern in url_patterns:
-                matches = re.finditer(pattern, content)
-                for match in matches:
-                    path = match.group(1)
-                    view_name = match.group(2)
-                    
-                    # Django URLs typically handle multiple methods
-                    endpoint = {
-                        "method": "GET",  # Default, actual methods depend on view
-                        "path": path,
-                        "source": "django",
-                        "source_file": str(file_path),
-                        "view_name": view_name,
-                        "parameters": self._extract_django_params(path),
-                        "auth_requirements": [],
-                        "security_hints": self._analyze_endpoint_patterns("GET", path, content)
-                    }
-                    
-                    endpoints.append(endpoint)
-        
+        src_file = sys.intern(str(file_path))
+
+        for path, view_name in routes:
+            # Django URLs typically handle multiple methods
+            endpoint = {
+                "method": "GET",  # Default, actual methods depend on view
+                "path": path,
+                "source": "django",
+                "source_file": src_file,
+                "view_name": view_name,
+                "parameters": self._extract_django_params(path),
+                "auth_requirements": [],
+                "security_hints": self._analyze_endpoint_patterns("GET", path, facts)
+            }
+
+            endpoints.append(endpoint)
+
         return endpoints
-    
-    def _discover_drf_routes(self, content: str, file_path: Path) -> List[Dict[str, Any]]:
-        """Discover Django REST Framework routes."""
+
+    def _discover_drf_routes(self, views: List[tuple], facts: Dict[str, Any],
+                            file_path: Path) -> List[Dict[str, Any]]:
+        """Build endpoint dicts from discovered DRF class-based views."""
         endpoints = []
-        
-        # DRF ViewSet patterns
-        if "ViewSet" in content or "APIView" in content:
-            # Look for class-based views
-            class_pattern = r'class\s+(\w+)\s*\([^)]*(?:ViewSet|APIView)[^)]*\)'
-            class_matches = re.finditer(class_pattern, content)
-            
-            for class_match in class_matches:
-                class_name = class_match.group(1)
-                
-                # Look for method definitions in the class
-                method_patterns = [
-                    r'def\s+(get|post|put|patch|delete|head|options)\s*\(',
-                    r'def\s+(list|create|retrieve|update|partial_update|destroy)\s*\('
-                ]
-                
-                for method_pattern in method_patterns:
-                    method_matches = re.finditer(method_pattern, content)
-                    for method_match in method_matches:
-                        method_name = method_match.group(1)
-                        
-                        # Map DRF method names to HTTP methods
-                        http_method = self._map_drf_method(method_name)
-                        
-                        endpoint = {
-                            "method": http_method,
-                            "path": f"/{class_name.lower()}/",  # Approximate path
-                            "source": "drf",
-                            "source_file": str(file_path),
-                            "view_class": class_name,
-                            "view_method": method_name,
-                            "parameters": [],
-                            "auth_requirements": self._extract_drf_permissions(content),
-                            "security_hints": self._analyze_endpoint_patterns(http_method, f"/{class_name.lower()}/", content)
-                        }
-                        
-                        endpoints.append(endpoint)
-        
+        src_file = sys.intern(str(file_path))
+
+        for class_name, method_names in views:
+            for method_name in method_names:
+                # Map DRF method names to HTTP methods
+                http_method = self._map_drf_method(method_name)
+
+                endpoint = {
+                    "method": sys.intern(http_method),
+                    "path": f"/{class_name.lower()}/",  # Approximate path
+                    "source": "drf",
+                    "source_file": src_file,
+                    "view_class": class_name,
+                    "view_method": method_name,
+                    "parameters": [],
+                    "auth_requirements": facts["drf_permissions"],
+                    "security_hints": self._analyze_endpoint_patterns(http_method, f"/{class_name.lower()}/", facts)
+                }
+
+                endpoints.append(endpoint)
+
         return endpoints
     
-    def _extract_fastapi_params(self, path: str, content: str) -> List[Dict[str, Any]]:
+    def _extract_fastapi_params(self, path: str) -> List[Dict[str, Any]]:
         """Extract FastAPI path and query parameters."""
         params = []
         
@@ -382,8 +547,8 @@ class PythonDiscovery:
         }
         return mapping.get(method_name.lower(), "GET")
     
-    def _analyze_endpoint_patterns(self, method: str, path: str, content: str) -> List[str]:
-        """Analyze endpoint for security patterns."""
+    def _analyze_endpoint_patterns(self, method: str, path: str, facts: Dict[str, Any]) -> List[str]:
+        """Analyze endpoint for security patterns using precomputed file facts."""
         hints = []
         
         path_lower = path.lower()
@@ -401,15 +566,8 @@ class PythonDiscovery:
         if any(pattern in path_lower for pattern in sensitive_patterns):
             hints.append("sensitive_path")
         
-        # Check for authentication decorators/dependencies
-        auth_patterns = [
-            r'@login_required', r'@auth', r'@jwt_required',
-            r'Depends\s*\(', r'Security\s*\(',
-            r'permission_classes', r'IsAuthenticated'
-        ]
-        
-        has_auth = any(re.search(pattern, content, re.IGNORECASE) for pattern in auth_patterns)
-        if has_auth:
+        # Authentication decorators/dependencies are a file-level fact
+        if facts["has_auth"]:
             hints.append("has_auth_middleware")
         else:
             hints.append("no_auth_detected")
@@ -421,7 +579,7 @@ class PythonDiscovery:
         findings = []
         
         # Debug mode enabled
-        if re.search(r'DEBUG\s*=\s*True', content):
+        if 'DEBUG' in content and _DEBUG_RE.search(content):
             findings.append({
                 "type": "debug_mode",
                 "severity": "medium",
@@ -447,7 +605,7 @@ class PythonDiscovery:
                 })
         
         # Insecure CORS settings
-        if re.search(r'CORS_ALLOW_ALL_ORIGINS\s*=\s*True', content):
+        if 'CORS_ALLOW_ALL_ORIGINS' in content and _CORS_RE.search(content):
             findings.append({
                 "type": "cors_wildcard",
                 "severity": "medium",
@@ -2,9 +2,11 @@
 Repository ingestion and environment loading.
 """
 
+import hashlib
+import json
 import os
 import shutil
-import tempfile
+import subprocess
 from pathlib import Path
 from typing import Optional
 from urllib.parse import urlparse
@@ -13,6 +15,11 @@ import git
 from dotenv import load_dotenv
 from rich.console import Console
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 console = Console()
 
 class RepoIngestor:
@@ -52,18 +59,38 @@ class RepoIngestor:
             return self._use_local_repo(repo)
     
     def _clone_repo(self, git_url: str) -> Path:
-        """Clone repository from Git URL."""
+        """Clone repository from Git URL, reusing a cached clone when possible."""
         if self.verbose:
             console.print(f"   Cloning repository: {git_url}")
-        
-        # Create temporary directory for cloning
-        temp_dir = Path(tempfile.mkdtemp(prefix="secagent_repo_"))
-        self.temp_dirs.append(temp_dir)
-        
+
+        # Cache clones per URL so repeated runs only pay an incremental fetch.
+        # Cached clones are not registered in temp_dirs, so cleanup keeps them.
+        cache_root = Path.home() / ".cache" / "secagent" / "repos"
+        clone_dir = cache_root / hashlib.sha1(git_url.encode('utf-8')).hexdigest()
+
         try:
-            # Clone repository
-            repo = git.Repo.clone_from(git_url, temp_dir)
-            
+            if (clone_dir / ".git").exists():
+                if self.verbose:
+                    console.print(f"   Reusing cached clone: {clone_dir}")
+                subprocess.run(
+                    ['git', '-C', str(clone_dir), 'fetch', '--depth=1', 'origin', 'HEAD'],
+                    check=True, capture_output=True, text=True
+                )
+                subprocess.run(
+                    ['git', '-C', str(clone_dir), 'reset', '--hard', 'FETCH_HEAD'],
+                    check=True, capture_output=True, text=True
+                )
+            else:
+                cache_root.mkdir(parents=True, exist_ok=True)
+                # Shallow single-branch clone - static analysis never needs
+                # history, and the blob filter defers fetches we never trigger
+                subprocess.run(
+                    ['git', 'clone', '--depth=1', '--single-branch', '--no-tags',
+                     '--filter=blob:none', git_url, str(clone_dir)],
+                    check=True, capture_output=True, text=True
+                )
+            repo = git.Repo(clone_dir)
+
             # Get basic repo info
             try:
                 origin_url = repo.remotes.origin.url
@@ -81,21 +108,19 @@ class RepoIngestor:
                     "url": git_url,
                     "branch": current_branch,
                     "commit": latest_commit,
-                    "local_path": str(temp_dir)
+                    "local_path": str(clone_dir)
                 }
                 
-                import json
-                with open(self.run_dir / "repo_info.json", "w") as f:
-                    json.dump(repo_info, f, indent=2)
-                    
+                self._save_repo_info(repo_info)
+
             except Exception as e:
                 if self.verbose:
                     console.print(f"   ⚠️  Could not get repo info: {e}", style="yellow")
             
-            return temp_dir
-            
-        except git.GitCommandError as e:
-            console.print(f"   ❌ Failed to clone repository: {e}", style="red")
+            return clone_dir
+
+        except subprocess.CalledProcessError as e:
+            console.print(f"   ❌ Failed to clone repository: {e.stderr or e}", style="red")
             raise
     
     def _use_local_repo(self, repo_path: str) -> Path:
@@ -139,12 +164,19 @@ class RepoIngestor:
                     console.print(f"   ⚠️  Could not read Git info: {e}", style="yellow")
         
         # Save repo metadata
-        import json
-        with open(self.run_dir / "repo_info.json", "w") as f:
-            json.dump(repo_info, f, indent=2)
-        
+        self._save_repo_info(repo_info)
+
         return path
-    
+
+    def _save_repo_info(self, repo_info: dict) -> None:
+        """Write repo metadata, using orjson's fast encoder when available."""
+        info_path = self.run_dir / "repo_info.json"
+        if orjson is not None:
+            info_path.write_bytes(orjson.dumps(repo_info, option=orjson.OPT_INDENT_2))
+        else:
+            with open(info_path, "w") as f:
+                json.dump(repo_info, f, indent=2)
+
     def cleanup(self):
         """Clean up temporary directories."""
         for temp_dir in self.temp_dirs:
@@ -2,34 +2,185 @@
 Ollama LLM client for enhanced security reporting.
 """
 
+import asyncio
+import hashlib
 import json
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
 from typing import Dict, Any, Optional, List
 import httpx
 from rich.console import Console
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 console = Console()
 
+def _json_excerpt(data: Any, limit: Optional[int] = None) -> str:
+    """Pretty-print data as JSON, optionally truncated, via orjson when available.
+
+    Stdlib json.dumps with indent is slow and allocates the full string
+    just to slice a few hundred bytes; orjson serializes in C and lets us
+    truncate the bytes before decoding.
+    """
+    if orjson is not None:
+        raw = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        if limit is not None:
+            raw = raw[:limit]
+        return raw.decode('utf-8', errors='ignore')
+    text = json.dumps(data, indent=2)
+    return text[:limit] if limit is not None else text
+
+def _json_loads(content: bytes) -> Any:
+    """Parse a JSON response body with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+# Static prompt prefixes, kept as module constants. Ollama only reuses its
+# KV cache when the prompt prefix is byte-identical across requests, so each
+# prompt front-loads all of its fixed instruction text and appends the
+# per-call dynamic values at the end.
+_REMEDIATION_PREFIX = """You are a cybersecurity expert. Provide concise remediation advice for the vulnerability described below.
+
+Provide specific, actionable remediation steps in 2-3 sentences. Focus on:
+1. Root cause
+2. Immediate fix
+3. Prevention strategy
+
+Response should be professional and technical but accessible."""
+
+_SUMMARY_PREFIX = """You are a cybersecurity analyst. Create an executive summary for the API security assessment described below.
+
+Write a 3-4 sentence executive summary highlighting:
+1. Overall security posture
+2. Key risks identified
+3. Priority recommendations
+
+Keep it business-focused and actionable."""
+
+_EXPLANATION_PREFIX = """Explain the security finding described below in simple terms.
+
+Provide a 1-2 sentence explanation of:
+1. What this means
+2. Why it matters
+
+Keep it clear and non-technical."""
+
+_PATTERN_PREFIX = """You are a cybersecurity expert analyzing vulnerability patterns in an API.
+
+Analyze the vulnerabilities listed below and provide insights on:
+1. Common attack vectors present
+2. Systemic security weaknesses
+3. Risk correlation patterns
+4. Priority areas for security improvement
+
+Provide a technical analysis in 4-5 sentences focusing on actionable insights."""
+
+_RECOMMENDATIONS_PREFIX = """You are a cybersecurity consultant providing security recommendations for the API described below.
+
+Provide 4-5 specific security recommendations prioritized by impact:
+1. Authentication & Authorization improvements
+2. Input validation enhancements
+3. Security configuration hardening
+4. Monitoring and detection capabilities
+
+Focus on practical, implementable solutions."""
+
 class OllamaClient:
     """Client for interacting with Ollama local LLM."""
     
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3"):
+    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3",
+                 request_timeout: float = 10.0, max_retries: int = 2):
         self.base_url = base_url.rstrip('/')
         self.model = model
-        self.available = None  # Cache availability check
-    
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        # Keep the model resident between calls so the prompt-prefix KV
+        # cache built by one request is still warm for the next
+        self.keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+        self.available = None  # Cache availability check, refreshed on a TTL
+        self._avail_cached_at: Optional[float] = None
+        self._avail_ttl = 30.0
+        # Cache "down" for less time than "up" so a server started
+        # mid-run is noticed quickly
+        self._avail_neg_ttl = 5.0
+
+        # Exact-match response cache. Scans generate many identical prompts
+        # (same finding type, same severity), so caching (model, prompt,
+        # options) -> response eliminates most repeat round-trips. The
+        # sqlite file makes hits survive across runs.
+        self._cache: Dict[str, str] = {}
+        self._cache_db: Optional[sqlite3.Connection] = None
+
+        # Semantic cache for remediation prompts. Prompts for the same
+        # vuln_type differ only in path/evidence, so a near-duplicate by
+        # embedding distance can reuse the earlier response. Entries are
+        # partitioned by (vuln_type, severity) so that semantically close
+        # but differently-typed findings never collide.
+        self._sem_entries: List[tuple] = []  # (vuln_type, severity, response)
+        self._sem_matrix = None  # L2-normalized float32 (N, D) matrix
+
+        # One persistent client keeps the TCP connection and pool alive
+        # across the many calls a single report generation makes
+        self._client = httpx.Client(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=8, max_connections=16)
+        )
+
+    def close(self) -> None:
+        """Close the underlying HTTP client."""
+        self._client.close()
+        if self._cache_db is not None:
+            self._cache_db.close()
+            self._cache_db = None
+
+    def __enter__(self) -> "OllamaClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
     def is_available(self) -> bool:
-        """Check if Ollama is available and responsive."""
-        if self.available is not None:
-            return self.available
-        
-        try:
-            with httpx.Client(timeout=5.0) as client:
-                response = client.get(f"{self.base_url}/api/tags")
-                self.available = response.status_code == 200
+        """Check if Ollama is available and responsive.
+
+        The result is cached with a TTL rather than forever: a server
+        started mid-run is picked up on the next refresh, and a crashed
+        one is noticed here with a fast connect timeout instead of by a
+        real call waiting out its full 30s deadline.
+        """
+        now = time.monotonic()
+        if self.available is not None and self._avail_cached_at is not None:
+            ttl = self._avail_ttl if self.available else self._avail_neg_ttl
+            if now - self._avail_cached_at < ttl:
                 return self.available
+
+        try:
+            response = self._client.get(
+                "/api/tags", timeout=httpx.Timeout(connect=1.0, read=2.0, write=2.0, pool=2.0)
+            )
+            self.available = response.status_code == 200
         except Exception:
             self.available = False
-            return False
+
+        self._avail_cached_at = now
+        return self.available
     
     def generate_remediation(self, vulnerability: Dict[str, Any]) -> str:
         """Generate remediation advice for a vulnerability."""
@@ -37,16 +188,241 @@ class OllamaClient:
             return self._fallback_remediation(vulnerability)
         
         prompt = self._create_remediation_prompt(vulnerability)
-        
+        vuln_type = vulnerability.get("test_type", "unknown")
+        severity = vulnerability.get("severity", "unknown")
+
+        embedding = self._embed(prompt)
+        cached = self._semantic_lookup(vuln_type, severity, embedding)
+        if cached is not None:
+            return cached
+
         try:
             response = self._generate(prompt)
+            if response and len(response.strip()) > 50:
+                text = response.strip()
+                self._semantic_store(vuln_type, severity, embedding, text)
+                return text
+        except Exception as e:
+            console.print(f"   ⚠️  Ollama generation failed: {e}", style="yellow")
+
+        return self._fallback_remediation(vulnerability)
+
+    def generate_remediations_batch(self, vulnerabilities: List[Dict[str, Any]]) -> List[str]:
+        """Generate remediation advice for many vulnerabilities concurrently.
+
+        Fans the per-vulnerability calls out with asyncio.gather so wall time
+        is bounded by Ollama's server-side parallelism (OLLAMA_NUM_PARALLEL)
+        instead of the sum of serial round trips.
+        """
+        if not vulnerabilities:
+            return []
+
+        if not self.is_available():
+            return [self._fallback_remediation(v) for v in vulnerabilities]
+
+        # One batched /api/embed call covers every prompt, so the semantic
+        # cache costs a single extra round-trip for the whole batch.
+        prompts = [self._create_remediation_prompt(v) for v in vulnerabilities]
+        keys = [(v.get("test_type", "unknown"), v.get("severity", "unknown"))
+                for v in vulnerabilities]
+        embeddings = self.embed_batch(prompts)
+
+        results: List[Optional[str]] = [None] * len(vulnerabilities)
+        pending = []
+        for i, (vuln_type, severity) in enumerate(keys):
+            embedding = embeddings[i] if embeddings is not None else None
+            cached = self._semantic_lookup(vuln_type, severity, embedding)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+
+        if pending:
+            generated = asyncio.run(
+                self._generate_remediations_async([vulnerabilities[i] for i in pending])
+            )
+            for i, text in zip(pending, generated):
+                results[i] = text
+                if embeddings is not None and text != self._fallback_remediation(vulnerabilities[i]):
+                    self._semantic_store(keys[i][0], keys[i][1], embeddings[i], text)
+
+        return results
+
+    async def _generate_remediations_async(self, vulnerabilities: List[Dict[str, Any]]) -> List[str]:
+        """Run all remediation generations concurrently over one async client.
+
+        aiohttp is preferred when installed: it has lower per-request Python
+        overhead than httpx's AsyncClient, which matters once the fan-out is
+        wide. httpx remains the fallback so the perf extra stays optional.
+        """
+        parallel = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+
+        if aiohttp is not None:
+            connector = aiohttp.TCPConnector(limit=parallel, keepalive_timeout=60)
+            timeout = aiohttp.ClientTimeout(total=30)
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                return await asyncio.gather(
+                    *(self._generate_remediation_async(session, v) for v in vulnerabilities)
+                )
+
+        limits = httpx.Limits(max_connections=parallel)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=30.0, limits=limits) as client:
+            return await asyncio.gather(
+                *(self._generate_remediation_async(client, v) for v in vulnerabilities)
+            )
+
+    async def _generate_remediation_async(self, client: Any,
+                                          vulnerability: Dict[str, Any]) -> str:
+        """Async counterpart of generate_remediation for batch fan-out."""
+        prompt = self._create_remediation_prompt(vulnerability)
+
+        try:
+            response = await self._agenerate(client, prompt)
             if response and len(response.strip()) > 50:
                 return response.strip()
         except Exception as e:
             console.print(f"   ⚠️  Ollama generation failed: {e}", style="yellow")
-        
+
         return self._fallback_remediation(vulnerability)
-    
+
+    async def _agenerate(self, client: Any, prompt: str,
+                         max_tokens: int = 500) -> Optional[str]:
+        """Generate with a per-call deadline, retrying stragglers with backoff.
+
+        Ollama latency is long-tailed; timing out just above the typical
+        response time and retrying beats waiting out slow requests.
+        """
+        cache_key = self._cache_key(prompt, max_tokens)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                text = await asyncio.wait_for(
+                    self._agen_once(client, prompt, max_tokens),
+                    timeout=self.request_timeout
+                )
+                if text:
+                    self._cache_put(cache_key, text)
+                return text
+            except asyncio.TimeoutError:
+                if attempt >= self.max_retries:
+                    raise Exception(f"Ollama timed out after {self.max_retries + 1} attempts")
+                await asyncio.sleep(0.5 * (2 ** attempt))
+
+    async def _agen_once(self, client: Any, prompt: str,
+                         max_tokens: int = 500) -> Optional[str]:
+        """Generate response using the Ollama API over an async client."""
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": self.keep_alive,
+            "options": {
+                "num_predict": max_tokens,
+                "temperature": 0.3,
+                "top_p": 0.9
+            }
+        }
+
+        if aiohttp is not None and isinstance(client, aiohttp.ClientSession):
+            async with client.post(f"{self.base_url}/api/generate", json=payload) as resp:
+                if resp.status == 200:
+                    return _json_loads(await resp.read()).get("response", "")
+                raise Exception(f"Ollama API error: {resp.status}")
+
+        response = await client.post("/api/generate", json=payload)
+
+        if response.status_code == 200:
+            return _json_loads(response.content).get("response", "")
+        else:
+            raise Exception(f"Ollama API error: {response.status_code}")
+
+    _BATCH_SECTION_RE = re.compile(r'^\[(\d+)\]\s*(.*?)(?=^\[\d+\]|\Z)', re.MULTILINE | re.DOTALL)
+
+    def generate_batched(self, sections: List[Dict[str, str]],
+                         max_tokens: Optional[int] = None) -> Dict[str, str]:
+        """Generate several independent sections in one inference run.
+
+        Each section is a {"key", "instructions"} dict. The sections are
+        folded into a single indexed prompt and the response is split back
+        apart on the [i] markers, so N round-trips (each paying prefill and
+        TTFT) collapse into one. Sections the model fails to tag are simply
+        absent from the result; callers fall back per key.
+        """
+        if not sections:
+            return {}
+
+        # Generation tokens dominate latency, so hard-cap the output at a
+        # per-section budget rather than letting the model run long
+        if max_tokens is None:
+            max_tokens = min(2000, 160 * len(sections))
+
+        lines = [
+            "Produce the following numbered sections. "
+            "Return each one as '[i] <text>' on its own lines, in order, with no other output. "
+            "Be brief: respect each section's stated length limit."
+        ]
+        for i, section in enumerate(sections, 1):
+            lines.append(f"[{i}] {section['instructions']}")
+        prompt = "\n\n".join(lines)
+
+        response = self._generate(prompt, max_tokens=max_tokens) or ""
+
+        results: Dict[str, str] = {}
+        for match in self._BATCH_SECTION_RE.finditer(response):
+            index = int(match.group(1)) - 1
+            if 0 <= index < len(sections):
+                text = match.group(2).strip()
+                if text:
+                    results[sections[index]["key"]] = text
+        return results
+
+    def generate_many(self, prompts: Dict[str, str], max_tokens: int = 500) -> Dict[str, str]:
+        """Run several independent prompts concurrently.
+
+        The prompts have no data dependencies, so firing them together with
+        asyncio.gather bounds wall time by the slowest call instead of the
+        sum, and lets Ollama's server-side batching overlap the work. Keys
+        whose calls fail are left out of the result.
+        """
+        if not prompts:
+            return {}
+
+        if not self.is_available():
+            return {}
+
+        return asyncio.run(self._generate_many_async(prompts, max_tokens))
+
+    async def _generate_many_async(self, prompts: Dict[str, str],
+                                   max_tokens: int) -> Dict[str, str]:
+        """Fan prompts out over one async client and collect by key."""
+        parallel = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+        keys = list(prompts)
+
+        if aiohttp is not None:
+            connector = aiohttp.TCPConnector(limit=parallel, keepalive_timeout=60)
+            timeout = aiohttp.ClientTimeout(total=30)
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                results = await asyncio.gather(
+                    *(self._agenerate(session, prompts[k], max_tokens) for k in keys),
+                    return_exceptions=True
+                )
+        else:
+            limits = httpx.Limits(max_connections=parallel)
+            async with httpx.AsyncClient(base_url=self.base_url, timeout=30.0, limits=limits) as client:
+                results = await asyncio.gather(
+                    *(self._agenerate(client, prompts[k], max_tokens) for k in keys),
+                    return_exceptions=True
+                )
+
+        return {
+            key: result.strip()
+            for key, result in zip(keys, results)
+            if isinstance(result, str) and result.strip()
+        }
+
     def generate_summary(self, analysis_data: Dict[str, Any]) -> str:
         """Generate executive summary of security analysis."""
         if not self.is_available():
@@ -113,28 +489,199 @@ class OllamaClient:
     
     def _generate(self, prompt: str, max_tokens: int = 500) -> Optional[str]:
         """Generate response using Ollama API."""
+        cache_key = self._cache_key(prompt, max_tokens)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         payload = {
             "model": self.model,
             "prompt": prompt,
             "stream": False,
+            "keep_alive": self.keep_alive,
             "options": {
                 "num_predict": max_tokens,
                 "temperature": 0.3,
                 "top_p": 0.9
             }
         }
-        
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(
-                f"{self.base_url}/api/generate",
-                json=payload
+
+        response = self._client.post("/api/generate", json=payload)
+
+        if response.status_code == 200:
+            result = _json_loads(response.content)
+            text = result.get("response", "")
+            if text:
+                self._cache_put(cache_key, text)
+            return text
+        else:
+            raise Exception(f"Ollama API error: {response.status_code}")
+
+    SEMANTIC_THRESHOLD = 0.92
+    EMBED_MODEL = "nomic-embed-text"
+
+    def _embed(self, prompt: str):
+        """Embed a prompt via Ollama; None when embeddings are unavailable."""
+        if np is None:
+            return None
+
+        try:
+            response = self._client.post(
+                "/api/embeddings",
+                json={"model": self.EMBED_MODEL, "prompt": prompt}
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("response", "")
-            else:
+            if response.status_code != 200:
+                return None
+            vector = np.asarray(_json_loads(response.content).get("embedding", []), dtype=np.float32)
+            if vector.size == 0:
+                return None
+            return vector / np.linalg.norm(vector)
+        except Exception:
+            return None
+
+    def embed_batch(self, prompts: List[str]):
+        """Embed many prompts in one /api/embed request.
+
+        Returns an L2-normalized float32 (N, D) matrix, or None when
+        embeddings are unavailable. Batching amortizes the client-server
+        round-trip that per-prompt /api/embeddings calls would each pay.
+        """
+        if np is None or not prompts:
+            return None
+
+        try:
+            response = self._client.post(
+                "/api/embed",
+                json={"model": self.EMBED_MODEL, "input": prompts}
+            )
+            if response.status_code != 200:
+                return None
+            matrix = np.asarray(_json_loads(response.content).get("embeddings", []), dtype=np.float32)
+            if matrix.ndim != 2 or matrix.shape[0] != len(prompts):
+                return None
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            return matrix / norms
+        except Exception:
+            return None
+
+    def _semantic_lookup(self, vuln_type: str, severity: str, embedding) -> Optional[str]:
+        """Return a cached response whose prompt is semantically near enough."""
+        if embedding is None or self._sem_matrix is None:
+            return None
+
+        candidates = [i for i, (t, s, _) in enumerate(self._sem_entries)
+                      if t == vuln_type and s == severity]
+        if not candidates:
+            return None
+
+        scores = self._sem_matrix[candidates] @ embedding
+        best = int(scores.argmax())
+        if scores[best] < self.SEMANTIC_THRESHOLD:
+            return None
+        return self._sem_entries[candidates[best]][2]
+
+    def _semantic_store(self, vuln_type: str, severity: str, embedding, response: str) -> None:
+        """Add a generated response to the semantic cache."""
+        if embedding is None:
+            return
+
+        self._sem_entries.append((vuln_type, severity, response))
+        row = embedding.reshape(1, -1)
+        if self._sem_matrix is None:
+            self._sem_matrix = row
+        else:
+            self._sem_matrix = np.vstack([self._sem_matrix, row])
+
+    def _generate_stream(self, prompt: str, max_tokens: int = 500,
+                         early_exit_chars: Optional[int] = None) -> Optional[str]:
+        """Generate with streaming, optionally aborting once enough text arrived.
+
+        Streaming overlaps network transfer with accumulation, and
+        early_exit_chars lets callers that only need a threshold amount of
+        text (length-gated summaries) close the response early, freeing the
+        Ollama slot instead of waiting out the full generation.
+        """
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": self.keep_alive,
+            "options": {
+                "num_predict": max_tokens,
+                "temperature": 0.3,
+                "top_p": 0.9
+            }
+        }
+
+        chunks = []
+        total_chars = 0
+        with self._client.stream("POST", "/api/generate", json=payload) as response:
+            if response.status_code != 200:
                 raise Exception(f"Ollama API error: {response.status_code}")
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = _json_loads(line.encode('utf-8') if isinstance(line, str) else line)
+                piece = data.get("response", "")
+                if piece:
+                    chunks.append(piece)
+                    total_chars += len(piece)
+                    if early_exit_chars is not None and total_chars >= early_exit_chars:
+                        response.close()
+                        break
+                if data.get("done"):
+                    break
+
+        return "".join(chunks)
+
+    def _cache_key(self, prompt: str, max_tokens: int) -> str:
+        """Derive the exact-match cache key for a generation request."""
+        raw = f"{self.model}\x00{prompt}\x00{max_tokens}".encode('utf-8')
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Look up a cached response, falling through to the sqlite store."""
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        db = self._cache_connection()
+        if db is not None:
+            row = db.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._cache[key] = row[0]
+                return row[0]
+        return None
+
+    def _cache_put(self, key: str, response: str) -> None:
+        """Store a response in both the in-memory and persistent caches."""
+        self._cache[key] = response
+
+        db = self._cache_connection()
+        if db is not None:
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)",
+                (key, response)
+            )
+            db.commit()
+
+    def _cache_connection(self) -> Optional[sqlite3.Connection]:
+        """Open (lazily) the persistent response cache; None if unavailable."""
+        if self._cache_db is None:
+            try:
+                cache_dir = Path.home() / ".secagent"
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                self._cache_db = sqlite3.connect(cache_dir / "ollama_cache.sqlite")
+                self._cache_db.execute("PRAGMA journal_mode=WAL")
+                self._cache_db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT)"
+                )
+            except Exception:
+                # A broken cache should never break generation
+                return None
+        return self._cache_db
     
     def _create_remediation_prompt(self, vulnerability: Dict[str, Any]) -> str:
         """Create prompt for vulnerability remediation."""
@@ -146,28 +693,19 @@ class OllamaClient:
         method = endpoint.get("method", "GET")
         path = endpoint.get("path", "/")
         
-        prompt = f"""You are a cybersecurity expert. Provide concise remediation advice for this vulnerability:
+        return _REMEDIATION_PREFIX + f"""
 
 **Vulnerability Type:** {vuln_type}
 **Severity:** {severity}
 **Endpoint:** {method} {path}
-**Evidence:** {json.dumps(evidence, indent=2)[:500]}
-
-Provide specific, actionable remediation steps in 2-3 sentences. Focus on:
-1. Root cause
-2. Immediate fix
-3. Prevention strategy
-
-Response should be professional and technical but accessible."""
-        
-        return prompt
+**Evidence:** {_json_excerpt(evidence, 500)}"""
     
     def _create_summary_prompt(self, analysis_data: Dict[str, Any]) -> str:
         """Create prompt for executive summary."""
         stats = analysis_data.get("stats", {})
         vulnerabilities = analysis_data.get("vulnerabilities", [])
         
-        prompt = f"""You are a cybersecurity analyst. Create an executive summary for this API security assessment:
+        return _SUMMARY_PREFIX + f"""
 
 **Assessment Statistics:**
 - Total endpoints analyzed: {stats.get('total_endpoints', 0)}
@@ -177,16 +715,7 @@ Response should be professional and technical but accessible."""
 - Low severity: {stats.get('low_severity', 0)}
 
 **Top Vulnerabilities:**
-{json.dumps(vulnerabilities[:3], indent=2)[:800]}
-
-Write a 3-4 sentence executive summary highlighting:
-1. Overall security posture
-2. Key risks identified
-3. Priority recommendations
-
-Keep it business-focused and actionable."""
-        
-        return prompt
+{_json_excerpt(vulnerabilities[:3], 800)}"""
     
     def _create_explanation_prompt(self, finding: Dict[str, Any]) -> str:
         """Create prompt for finding explanation."""
@@ -194,19 +723,11 @@ Keep it business-focused and actionable."""
         severity = finding.get("severity", "unknown")
         message = finding.get("message", "")
         
-        prompt = f"""Explain this security finding in simple terms:
+        return _EXPLANATION_PREFIX + f"""
 
 **Type:** {finding_type}
 **Severity:** {severity}
-**Description:** {message}
-
-Provide a 1-2 sentence explanation of:
-1. What this means
-2. Why it matters
-
-Keep it clear and non-technical."""
-        
-        return prompt
+**Description:** {message}"""
     
     def _create_pattern_analysis_prompt(self, vulnerabilities: List[Dict[str, Any]]) -> str:
         """Create prompt for vulnerability pattern analysis."""
@@ -218,20 +739,10 @@ Keep it clear and non-technical."""
                 "endpoint": f"{vuln.get('method', 'GET')} {vuln.get('path', '/')}"
             })
         
-        prompt = f"""You are a cybersecurity expert analyzing vulnerability patterns in an API. 
+        return _PATTERN_PREFIX + f"""
 
 **Vulnerabilities Found:**
-{json.dumps(vuln_summary, indent=2)}
-
-Analyze these vulnerabilities and provide insights on:
-1. Common attack vectors present
-2. Systemic security weaknesses
-3. Risk correlation patterns
-4. Priority areas for security improvement
-
-Provide a technical analysis in 4-5 sentences focusing on actionable insights."""
-        
-        return prompt
+{_json_excerpt(vuln_summary)}"""
     
     def _create_recommendations_prompt(self, endpoint_data: Dict[str, Any]) -> str:
         """Create prompt for security recommendations."""
@@ -239,7 +750,7 @@ Provide a technical analysis in 4-5 sentences focusing on actionable insights.""
         technologies = endpoint_data.get("technologies", [])
         findings = endpoint_data.get("findings", [])
         
-        prompt = f"""You are a cybersecurity consultant providing security recommendations for an API.
+        return _RECOMMENDATIONS_PREFIX + f"""
 
 **API Overview:**
 - Total endpoints: {len(endpoints)}
@@ -247,20 +758,10 @@ Provide a technical analysis in 4-5 sentences focusing on actionable insights.""
 - Security findings: {len(findings)}
 
 **Sample Endpoints:**
-{json.dumps(endpoints[:3], indent=2)[:600]}
+{_json_excerpt(endpoints[:3], 600)}
 
 **Security Findings:**
-{json.dumps(findings[:3], indent=2)[:400]}
-
-Provide 4-5 specific security recommendations prioritized by impact:
-1. Authentication & Authorization improvements
-2. Input validation enhancements  
-3. Security configuration hardening
-4. Monitoring and detection capabilities
-
-Focus on practical, implementable solutions."""
-        
-        return prompt
+{_json_excerpt(findings[:3], 400)}"""
     
     def _fallback_remediation(self, vulnerability: Dict[str, Any]) -> str:
         """Fallback remediation when Ollama is unavailable."""
@@ -2,16 +2,60 @@
 Endpoint normalization and parameter detection.
 """
 
+import itertools
+import os
 import re
-import uuid
-from typing import Dict, List, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional
 from rich.console import Console
 
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 console = Console()
 
+# Endpoint counts below this normalize serially; above it the per-endpoint
+# regex work is large enough to amortize process-pool startup and IPC
+_PARALLEL_THRESHOLD = 2000
+
+# Per-process normalizer for the process-pool path, built by the pool
+# initializer so endpoints (plain dicts) are the only things pickled
+_worker_normalizer: "Optional[EndpointNormalizer]" = None
+
+def _init_worker() -> None:
+    global _worker_normalizer
+    _worker_normalizer = EndpointNormalizer()
+
+def _normalize_one(endpoint: Dict[str, Any]) -> Dict[str, Any]:
+    return _worker_normalizer._normalize_endpoint(endpoint)
+
+def _compile(pattern: str, flags: int = 0):
+    """Compile with google-re2 when available, falling back to re.
+
+    re2's DFA engine gives linear-time matching on the simple id/name
+    patterns run against every parameter, but it rejects some constructs
+    (e.g. lookaheads), so any pattern it cannot handle silently uses re.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern, flags)
+        except Exception:
+            pass
+    return re.compile(pattern, flags)
+
 class EndpointNormalizer:
     """Normalizes discovered endpoints and detects security-relevant parameters."""
-    
+
+    ID_PATH_SEGMENTS = ("/{id}", "/{uuid}", "/users/", "/items/")
+
+
     def __init__(self):
         self.id_patterns = [
             r'\b(?:id|uuid|key|pk|_id)\b',
@@ -20,6 +64,30 @@ class EndpointNormalizer:
             r'\b[0-9a-f]{24}\b',  # MongoDB ObjectIds
             r'\b[A-Za-z0-9_-]{20,}\b'  # Long alphanumeric strings
         ]
+
+        # Compile once; these run against every endpoint path and parameter
+        # No IGNORECASE: names are lowercased before matching
+        self._id_name_re = _compile(self.id_patterns[0])
+
+        # Endpoint IDs only need to be unique within a run (the database
+        # lives under run_dir), so a counter beats a uuid4 per endpoint
+        self._next_id = itertools.count()
+        # One alternation covers every dynamic-segment format, so the path is
+        # scanned once instead of once per format
+        self._template_re = re.compile(
+            r'\{(?P<fa>\w+)\}'  # FastAPI/OpenAPI: {id}
+            r'|<(?:\w+:)?(?P<fl>\w+)>'  # Flask: <id> or <int:id>
+            r'|:(?P<ex>\w+)'  # Express: :id
+            r'|\(\?P<(?P<dj>\w+)>[^)]+\)'  # Django: (?P<id>\d+)
+            r'|(?P<uuid>/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}(?=/|$))'
+            r'|(?P<num>/\d+(?=/|$))'
+        )
+        self._path_param_patterns = [
+            (_compile(r'\{(\w+)\}'), 'string'),  # {id}
+            (_compile(r'<(?:(\w+):)?(\w+)>'), 'string'),  # <id> or <int:id>
+            (_compile(r':(\w+)'), 'string'),  # :id
+            (_compile(r'\(\?P<(\w+)>[^)]+\)'), 'string'),  # (?P<id>\d+)
+        ]
     
     def normalize(self, static_results: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -31,43 +99,94 @@ class EndpointNormalizer:
         Returns:
             List of normalized endpoint dictionaries
         """
-        normalized_endpoints = []
-        
-        for endpoint in static_results.get("endpoints", []):
-            normalized = self._normalize_endpoint(endpoint)
-            if normalized:
-                normalized_endpoints.append(normalized)
-        
+        endpoints = static_results.get("endpoints", [])
+
+        if len(endpoints) >= _PARALLEL_THRESHOLD:
+            results = self._normalize_parallel(endpoints)
+        else:
+            results = (self._normalize_endpoint(e) for e in endpoints)
+
+        normalized_endpoints = [r for r in results if r]
+
         # Remove duplicates based on method + path template
         unique_endpoints = self._deduplicate_endpoints(normalized_endpoints)
-        
+
         return unique_endpoints
-    
+
+    def _normalize_parallel(self, endpoints: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Normalize endpoints across a process pool.
+
+        Normalization is a pure function per endpoint dominated by regex
+        work that holds the GIL, so processes give real CPU parallelism on
+        big scans. chunksize amortizes IPC over many endpoints.
+        """
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker) as executor:
+            results = list(executor.map(_normalize_one, endpoints, chunksize=128))
+
+        # Each worker's ID counter restarts at zero, so reassign
+        # run-unique IDs from the parent's counter
+        for result in results:
+            if result:
+                result["id"] = f"ep-{next(self._next_id):08x}"
+
+        return results
+
+    def normalize_columnar(self, static_results: Dict[str, Any]) -> "pa.Table":
+        """
+        Normalize endpoints into a columnar pyarrow.Table.
+
+        For large scans, downstream bulk filters (e.g. all GET endpoints
+        with id parameters) run as C-level masks over columns instead of
+        Python loops over dicts. method and source are dictionary-encoded
+        since their cardinality is tiny. Requires pyarrow (perf extra).
+        """
+        if pa is None:
+            raise RuntimeError(
+                "normalize_columnar requires pyarrow; install with pip install codeapi-secagent[perf]"
+            )
+
+        endpoints = self.normalize(static_results)
+
+        return pa.table({
+            "id": pa.array([e["id"] for e in endpoints], type=pa.string()),
+            "method": pa.array([e["method"] for e in endpoints], type=pa.string()).dictionary_encode(),
+            "path_template": pa.array([e["path_template"] for e in endpoints], type=pa.string()),
+            "source": pa.array([e["source"] for e in endpoints], type=pa.string()).dictionary_encode(),
+            "auth_detected": pa.array([e["auth_detected"] for e in endpoints], type=pa.bool_()),
+            "id_param_count": pa.array([len(e["id_parameters"]) for e in endpoints], type=pa.int32()),
+            "security_hints": pa.array([e["security_hints"] for e in endpoints],
+                                       type=pa.list_(pa.string())),
+        })
+
     def _normalize_endpoint(self, endpoint: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize a single endpoint."""
         try:
-            # Extract basic information
+            # Extract basic information once; helpers receive the parsed
+            # values instead of re-reading the endpoint dict
             method = endpoint.get("method", "GET").upper()
             path = endpoint.get("path", "/")
+            path_lower = path.lower()
             source = endpoint.get("source", "unknown")
-            
+
             # Create path template (replace dynamic segments with placeholders)
             path_template = self._create_path_template(path)
-            
+
             # Extract and classify parameters
             parameters = self._extract_all_parameters(endpoint, path)
-            
+
             # Detect ID-like parameters for BOLA testing
             id_params = self._detect_id_parameters(parameters, path)
-            
+
             # Analyze authentication requirements
             auth_info = self._analyze_auth_requirements(endpoint)
-            
+
             # Generate security hints
-            security_hints = self._generate_security_hints(endpoint, parameters, id_params)
+            security_hints = self._generate_security_hints(
+                endpoint, id_params, auth_info, method, path_lower
+            )
             
             normalized = {
-                "id": str(uuid.uuid4()),
+                "id": f"ep-{next(self._next_id):08x}",
                 "method": method,
                 "path": path,
                 "path_template": path_template,
@@ -99,26 +218,17 @@ class EndpointNormalizer:
     
     def _create_path_template(self, path: str) -> str:
         """Create a path template by replacing dynamic segments."""
-        template = path
-        
-        # Replace various parameter formats with {param}
-        replacements = [
-            (r'\{(\w+)\}', r'{\1}'),  # FastAPI/OpenAPI: {id}
-            (r'<(?:\w+:)?(\w+)>', r'{\1}'),  # Flask: <id> or <int:id>
-            (r':(\w+)', r'{\1}'),  # Express: :id
-            (r'\(\?P<(\w+)>[^)]+\)', r'{\1}'),  # Django: (?P<id>\d+)
-        ]
-        
-        for pattern, replacement in replacements:
-            template = re.sub(pattern, replacement, template)
-        
-        # Replace numeric segments that look like IDs
-        template = re.sub(r'/\d+(?=/|$)', '/{id}', template)
-        
-        # Replace UUID-like segments
-        template = re.sub(r'/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}(?=/|$)', '/{uuid}', template)
-        
-        return template
+        return self._template_re.sub(self._template_replacement, path)
+
+    @staticmethod
+    def _template_replacement(match: "re.Match") -> str:
+        """Map an alternation match to its template placeholder."""
+        group = match.lastgroup
+        if group == 'uuid':
+            return '/{uuid}'
+        if group == 'num':
+            return '/{id}'
+        return '{' + match.group(group) + '}'
     
     def _extract_all_parameters(self, endpoint: Dict[str, Any], path: str) -> List[Dict[str, Any]]:
         """Extract all parameters from endpoint definition."""
@@ -130,9 +240,12 @@ class EndpointNormalizer:
             parameters.extend(existing_params)
         
         # Extract path parameters if not already captured
+        seen = {(p.get("name"), p.get("in")) for p in parameters}
         path_params = self._extract_path_parameters(path)
         for param in path_params:
-            if not any(p.get("name") == param["name"] and p.get("in") == "path" for p in parameters):
+            key = (param["name"], "path")
+            if key not in seen:
+                seen.add(key)
                 parameters.append(param)
         
         # Add common query parameters based on endpoint patterns
@@ -145,16 +258,8 @@ class EndpointNormalizer:
         """Extract path parameters from URL path."""
         parameters = []
         
-        # Various path parameter formats
-        param_patterns = [
-            (r'\{(\w+)\}', 'string'),  # {id}
-            (r'<(?:(\w+):)?(\w+)>', 'string'),  # <id> or <int:id>
-            (r':(\w+)', 'string'),  # :id
-            (r'\(\?P<(\w+)>[^)]+\)', 'string'),  # (?P<id>\d+)
-        ]
-        
-        for pattern, default_type in param_patterns:
-            matches = re.finditer(pattern, path)
+        for pattern, default_type in self._path_param_patterns:
+            matches = pattern.finditer(path)
             for match in matches:
                 if len(match.groups()) == 2:  # Flask-style with type
                     param_type = match.group(1) or default_type
@@ -222,25 +327,31 @@ class EndpointNormalizer:
     def _detect_id_parameters(self, parameters: List[Dict[str, Any]], path: str) -> List[Dict[str, Any]]:
         """Detect ID-like parameters that could be targets for BOLA attacks."""
         id_params = []
-        
+
+        # Path context is per-endpoint, not per-parameter - compute it once
+        path_l = path.lower()
+        path_suggests_id = any(segment in path_l for segment in self.ID_PATH_SEGMENTS)
+
         for param in parameters:
             param_name = param.get("name", "").lower()
             param_type = param.get("type", "")
-            
+
             # Check if parameter name suggests it's an ID
-            is_id_name = any(re.search(pattern, param_name, re.IGNORECASE) for pattern in self.id_patterns[:1])  # Just the name patterns
-            
+            is_id_name = bool(self._id_name_re.search(param_name))
+
             # Check if parameter type suggests it's an ID
             is_id_type = param_type in ["integer", "string"] and param.get("in") in ["path", "query"]
-            
-            # Additional context from path
-            path_suggests_id = any(segment in path.lower() for segment in ["/{id}", "/{uuid}", "/users/", "/items/"])
-            
+
             if is_id_name or (is_id_type and path_suggests_id):
-                id_param = param.copy()
-                id_param["id_confidence"] = self._calculate_id_confidence(param, path)
-                id_param["bola_testable"] = param.get("in") in ["path", "query"]
-                id_params.append(id_param)
+                # Store a slim record instead of copying the full parameter
+                # dict - consumers (BOLA test planning) only read these keys
+                id_params.append({
+                    "name": param.get("name"),
+                    "in": param.get("in"),
+                    "type": param_type,
+                    "id_confidence": self._calculate_id_confidence(param, path),
+                    "bola_testable": param.get("in") in ["path", "query"]
+                })
         
         return id_params
     
@@ -300,67 +411,59 @@ class EndpointNormalizer:
             "confidence": 0.8 if auth_detected else 0.2
         }
     
-    def _generate_security_hints(self, endpoint: Dict[str, Any], parameters: List[Dict[str, Any]], id_params: List[Dict[str, Any]]) -> List[str]:
+    def _generate_security_hints(self, endpoint: Dict[str, Any], id_params: List[Dict[str, Any]],
+                                 auth_info: Dict[str, Any], method: str, path_lower: str) -> List[str]:
         """Generate security testing hints for the endpoint."""
-        hints = []
-        
-        # Copy existing hints
+        # A set from the start keeps hints deduplicated as they are added,
+        # instead of a list pass plus a set pass at the end
         existing_hints = endpoint.get("security_hints", [])
-        if isinstance(existing_hints, list):
-            hints.extend(existing_hints)
-        
-        method = endpoint.get("method", "GET")
-        path = endpoint.get("path", "").lower()
-        
+        hints = set(existing_hints) if isinstance(existing_hints, list) else set()
+
         # BOLA testing hints
         if id_params:
-            hints.append("bola_testable")
+            hints.add("bola_testable")
             if any(p.get("bola_testable", False) for p in id_params):
-                hints.append("high_bola_risk")
-        
+                hints.add("high_bola_risk")
+
         # Authentication testing hints
-        auth_detected = "has_auth_middleware" in hints or endpoint.get("auth_requirements")
-        if not auth_detected:
-            hints.append("auth_bypass_testable")
-        
+        if not auth_info["detected"]:
+            hints.add("auth_bypass_testable")
+
         # JWT testing hints
-        if any("jwt" in str(req).lower() for req in endpoint.get("auth_requirements", [])):
-            hints.append("jwt_testable")
-        
+        if "jwt" in auth_info["types"]:
+            hints.add("jwt_testable")
+
         # Privilege escalation hints
-        if any(keyword in path for keyword in ["admin", "internal", "config", "settings"]):
-            hints.append("privilege_escalation_risk")
-        
+        if any(keyword in path_lower for keyword in ["admin", "internal", "config", "settings"]):
+            hints.add("privilege_escalation_risk")
+
         # Data exposure hints
-        if method == "GET" and any(keyword in path for keyword in ["list", "all", "dump", "export"]):
-            hints.append("data_exposure_risk")
-        
-        # Remove duplicates
-        return list(set(hints))
+        if method == "GET" and any(keyword in path_lower for keyword in ["list", "all", "dump", "export"]):
+            hints.add("data_exposure_risk")
+
+        return list(hints)
     
     def _deduplicate_endpoints(self, endpoints: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate endpoints based on method and path template."""
-        seen = set()
-        unique_endpoints = []
-        
+        index: Dict[tuple, Dict[str, Any]] = {}
+
         for endpoint in endpoints:
             key = (endpoint.get("method"), endpoint.get("path_template"))
-            if key not in seen:
-                seen.add(key)
-                unique_endpoints.append(endpoint)
+            existing = index.get(key)
+            if existing is None:
+                index[key] = endpoint
             else:
                 # Merge information from duplicate endpoints
-                existing = next(e for e in unique_endpoints if (e.get("method"), e.get("path_template")) == key)
                 self._merge_endpoint_info(existing, endpoint)
-        
-        return unique_endpoints
+
+        return list(index.values())
     
     def _merge_endpoint_info(self, existing: Dict[str, Any], new: Dict[str, Any]) -> None:
         """Merge information from a duplicate endpoint into the existing one."""
-        # Merge security hints
-        existing_hints = set(existing.get("security_hints", []))
-        new_hints = set(new.get("security_hints", []))
-        existing["security_hints"] = list(existing_hints | new_hints)
+        # Merge security hints (update in place to avoid rebuilding both sets)
+        merged_hints = set(existing.get("security_hints", []))
+        merged_hints.update(new.get("security_hints", []))
+        existing["security_hints"] = list(merged_hints)
         
         # Merge auth requirements
         existing_auth = set(str(a) for a in existing.get("auth_requirements", []))
@@ -376,9 +479,11 @@ class EndpointNormalizer:
         existing_params = existing.get("parameters", [])
         new_params = new.get("parameters", [])
         
+        seen = {(p.get("name"), p.get("in")) for p in existing_params}
         for new_param in new_params:
-            if not any(p.get("name") == new_param.get("name") and p.get("in") == new_param.get("in") 
-                      for p in existing_params):
+            key = (new_param.get("name"), new_param.get("in"))
+            if key not in seen:
+                seen.add(key)
                 existing_params.append(new_param)
         
         existing["parameters"] = existing_params
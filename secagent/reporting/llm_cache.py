@@ -0,0 +1,65 @@
+"""
+Content-addressed disk cache for LLM responses.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def key_for(operation: str, data: Any) -> str:
+    """Derive a stable cache key from an operation name and its input."""
+    payload = {"op": operation, "data": data}
+    if orjson is not None:
+        raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str)
+    else:
+        raw = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(raw).hexdigest()
+
+class LLMCache:
+    """Disk cache keyed by a content hash of the generation input.
+
+    Re-running the agent on unchanged test results (common during dev and
+    report re-generation) hits here and skips Ollama entirely. Set
+    SECAGENT_LLM_NOCACHE=1 to bypass. Cache problems never propagate: a
+    failed read is a miss and a failed write is dropped.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.enabled = os.getenv("SECAGENT_LLM_NOCACHE") != "1"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on miss."""
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            if path.exists():
+                return path.read_text(encoding='utf-8')
+        except OSError:
+            pass
+        return None
+
+    def put(self, key: str, value: str) -> None:
+        """Store a response under key."""
+        if not self.enabled:
+            return
+
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(value, encoding='utf-8')
+        except OSError:
+            pass
+
+    def _path(self, key: str) -> Path:
+        # Two-level fanout keeps directory listings small
+        return self.cache_dir / key[:2] / f"{key}.txt"
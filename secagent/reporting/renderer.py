@@ -2,23 +2,92 @@
 AI-powered security report generation.
 """
 
+import heapq
+import importlib.resources
 import json
 import hashlib
+import os
+import re
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
-from jinja2 import Environment, FileSystemLoader, Template
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, Template
+from markupsafe import Markup, escape
 from rich.console import Console
 
+from . import llm_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 console = Console()
 
+_SEV_RANK = {"high": 3, "medium": 2, "low": 1}
+
+# Max endpoint rows rendered into the report tables
+_ENDPOINT_DISPLAY_LIMIT = 500
+
+# Risk-score modifiers read from the AI pattern analysis; compiled with
+# IGNORECASE so no lowercase copy of the (long) AI text is made per call
+_UP_FACTOR = re.compile(r"\b(?:systemic|widespread)\b", re.IGNORECASE)
+_DOWN_FACTOR = re.compile(r"\b(?:isolated|limited)\b", re.IGNORECASE)
+
+def _tojson_filter(value: Any, indent: Optional[int] = None) -> Markup:
+    """orjson-backed replacement for Jinja's tojson filter.
+
+    Serializes in C instead of stdlib json, and applies the same
+    HTML-safe unicode escapes the builtin filter uses so the output can
+    be marked safe under autoescaping.
+    """
+    option = orjson.OPT_INDENT_2 if indent else 0
+    text = orjson.dumps(value, option=option, default=str).decode('utf-8')
+    text = (text.replace('&', '\\u0026')
+                .replace('<', '\\u003c')
+                .replace('>', '\\u003e')
+                .replace("'", '\\u0027'))
+    return Markup(text)
+
+# Shared across ReportRenderer instances so templates are tokenized and
+# compiled once per process (and cached to disk across processes)
+_jinja_env: Optional[Environment] = None
+_templates: Dict[str, Template] = {}
+
+def _get_template(template_dir: Path, name: str) -> Template:
+    """Return a compiled template, building the shared environment lazily."""
+    global _jinja_env
+    if _jinja_env is None:
+        cache_dir = template_dir / ".jinja_cache"
+        cache_dir.mkdir(exist_ok=True)
+        _jinja_env = Environment(
+            loader=FileSystemLoader(str(template_dir)),
+            autoescape=True,
+            bytecode_cache=FileSystemBytecodeCache(directory=str(cache_dir))
+        )
+        if orjson is not None:
+            _jinja_env.filters["tojson"] = _tojson_filter
+
+    template = _templates.get(name)
+    if template is None:
+        template = _jinja_env.get_template(name)
+        _templates[name] = template
+    return template
+
 class ReportRenderer:
     """AI-powered security report renderer."""
-    
+
+    # Template files only need to be checked/created once per process
+    _templates_initialized = False
+
     def __init__(self, run_dir: Path, ollama_client, verbose: bool = False):
         self.run_dir = run_dir
         self.ollama_client = ollama_client
         self.verbose = verbose
+        # Bind the verbose logger once instead of re-testing the flag at
+        # every call site
+        self._log = console.print if verbose else (lambda *args, **kwargs: None)
         
         # Ensure Ollama is available for hackathon
         if not self.ollama_client or not self.ollama_client.is_available():
@@ -34,72 +103,115 @@ class ReportRenderer:
         self.template_dir = Path(__file__).parent / "templates"
         self.template_dir.mkdir(exist_ok=True)
         
-        # Create templates if they don't exist
-        self._ensure_templates_exist()
-        
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(str(self.template_dir)),
-            autoescape=True
-        )
+        # Create templates if they don't exist (once per process)
+        if not type(self)._templates_initialized:
+            self._ensure_templates_exist()
+            type(self)._templates_initialized = True
+
+        # Cross-run cache of AI responses, keyed by input content hash
+        self._llm_cache = llm_cache.LLMCache(run_dir.parent / ".llm_cache")
     
     def generate_reports(self, target_info: Dict[str, Any], static_results: Dict[str, Any],
                         endpoints: List[Dict[str, Any]], test_results: List[Dict[str, Any]],
                         report_formats: List[str]) -> List[Path]:
         """Generate AI-powered security reports."""
-        
-        if self.verbose:
-            console.print("   🤖 Generating AI-powered security analysis...")
-        
-        # Step 1: Prepare data for AI analysis
+
+        # Resolve the requested formats once; if nothing is requested,
+        # skip AI analysis and context preparation entirely
+        wants_md = "md" in report_formats or "both" in report_formats
+        wants_html = "html" in report_formats or "both" in report_formats
+        if not (wants_md or wants_html):
+            return []
+
+        # One timestamp shared by every generated format
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        self._log("   🤖 Generating AI-powered security analysis...")
+
+        # Step 1: Classify test results once, then prepare data for AI analysis
+        classified = self._classify_test_results(test_results)
         analysis_data = self._prepare_analysis_data(
-            target_info, static_results, endpoints, test_results
+            static_results, endpoints, test_results, classified
         )
-        
+
         # Step 2: Generate AI insights
         ai_insights = self._generate_ai_insights(analysis_data)
-        
+
         # Step 3: Prepare report context
         report_context = self._prepare_report_context(
-            target_info, static_results, endpoints, test_results, ai_insights
+            target_info, static_results, endpoints, test_results, ai_insights,
+            classified, timestamp
         )
         
         # Step 4: Generate reports in requested formats
         generated_files = []
-        
-        if "md" in report_formats or "both" in report_formats:
+
+        if wants_md:
             md_file = self._generate_markdown_report(report_context)
             generated_files.append(md_file)
-        
-        if "html" in report_formats or "both" in report_formats:
+
+        if wants_html:
             html_file = self._generate_html_report(report_context)
             generated_files.append(html_file)
-        
+
         return generated_files
     
-    def _prepare_analysis_data(self, target_info: Dict[str, Any], static_results: Dict[str, Any],
-                              endpoints: List[Dict[str, Any]], test_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _classify_test_results(self, test_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Classify test results by status, severity and type in one pass.
+
+        Both the AI-analysis prep and the report context need the same
+        partitions, so they share this result instead of each re-scanning
+        test_results with a stack of comprehensions.
+        """
+        vulnerable: List[Dict[str, Any]] = []
+        secure: List[Dict[str, Any]] = []
+        errors: List[Dict[str, Any]] = []
+        severity = {"high": 0, "medium": 0, "low": 0}
+        by_type: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+        for result in test_results:
+            status = result.get("status")
+            if status == "vulnerable":
+                vulnerable.append(result)
+                sev = result.get("severity", "low")
+                severity[sev] = severity.get(sev, 0) + 1
+                by_type[result.get("test_type", "unknown")].append(result)
+            elif status == "secure":
+                secure.append(result)
+            elif status == "error":
+                errors.append(result)
+
+        return {
+            "vulnerable": vulnerable,
+            "secure": secure,
+            "errors": errors,
+            "severity": severity,
+            "by_type": dict(by_type)
+        }
+
+    def _prepare_analysis_data(self, static_results: Dict[str, Any], endpoints: List[Dict[str, Any]],
+                              test_results: List[Dict[str, Any]], classified: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare data for AI analysis."""
-        
-        # Calculate statistics
-        vulnerable_results = [r for r in test_results if r.get("status") == "vulnerable"]
-        
+        vulnerable_results = classified["vulnerable"]
+        severity = classified["severity"]
+
         stats = {
             "total_endpoints": len(endpoints),
             "total_tests": len(test_results),
             "vulnerable_count": len(vulnerable_results),
-            "high_severity": len([r for r in vulnerable_results if r.get("severity") == "high"]),
-            "medium_severity": len([r for r in vulnerable_results if r.get("severity") == "medium"]),
-            "low_severity": len([r for r in vulnerable_results if r.get("severity") == "low"]),
+            "high_severity": severity["high"],
+            "medium_severity": severity["medium"],
+            "low_severity": severity["low"],
             "technologies": static_results.get("technologies", []),
             "discovery_methods": static_results.get("discovery_methods", [])
         }
         
-        # Top vulnerabilities for AI analysis
-        top_vulnerabilities = sorted(
-            vulnerable_results,
-            key=lambda x: {"high": 3, "medium": 2, "low": 1}.get(x.get("severity", "low"), 0),
-            reverse=True
-        )[:10]
+        # Top vulnerabilities for AI analysis - a 10-element heap beats
+        # sorting the whole list just to slice it
+        top_vulnerabilities = heapq.nlargest(
+            10, vulnerable_results,
+            key=lambda x: _SEV_RANK.get(x.get("severity", "low"), 0)
+        )
         
         return {
             "stats": stats,
@@ -109,80 +221,175 @@ class ReportRenderer:
         }
     
     def _generate_ai_insights(self, analysis_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate AI-powered security insights."""
-        
-        if self.verbose:
-            console.print("   🧠 Generating executive summary...")
-        
+        """Generate AI-powered security insights.
+
+        All sections go out as one batched, indexed prompt so report
+        generation pays a single inference run instead of 3 + N serial
+        calls; any section the batch misses falls back to its per-call
+        path.
+        """
+        self._log("   🧠 Generating AI insights (batched)...")
+
+        stats = analysis_data["stats"]
+        vulnerabilities = analysis_data["vulnerabilities"]
+        top_vulns = vulnerabilities[:5]
+
+        sections = [{
+            "key": "executive_summary",
+            "instructions": (
+                "Executive summary (3-4 sentences, at most 80 words, business-focused) of this API "
+                f"security assessment: {json.dumps(stats, default=str)} "
+                f"Top vulnerabilities: {json.dumps(vulnerabilities[:3], default=str)[:800]}"
+            )
+        }]
+        if vulnerabilities:
+            vuln_summary = [
+                {
+                    "type": v.get("test_type", "unknown"),
+                    "severity": v.get("severity", "unknown"),
+                    "endpoint": f"{v.get('method', 'GET')} {v.get('path', '/')}"
+                }
+                for v in vulnerabilities[:5]
+            ]
+            sections.append({
+                "key": "pattern_analysis",
+                "instructions": (
+                    "Technical analysis (4-5 sentences, at most 100 words) of attack vectors, systemic "
+                    f"weaknesses and priorities in these vulnerabilities: {json.dumps(vuln_summary)}"
+                )
+            })
+        sections.append({
+            "key": "recommendations",
+            "instructions": (
+                "4-5 prioritized, practical security recommendations (at most 120 words total) for an API with "
+                f"technologies {', '.join(stats['technologies'])}, "
+                f"sample endpoints {json.dumps(analysis_data['endpoints'][:3], default=str)[:600]} "
+                f"and findings {json.dumps(analysis_data['findings'][:3], default=str)[:400]}"
+            )
+        })
+        for vuln in top_vulns:
+            sections.append({
+                "key": f"vuln:{vuln.get('id', 'unknown')}",
+                "instructions": (
+                    "Concise remediation advice (2-3 sentences, at most 60 words: root cause, fix, prevention) "
+                    f"for a {vuln.get('severity', 'unknown')}-severity "
+                    f"{vuln.get('test_type', 'unknown')} vulnerability: "
+                    f"{json.dumps(vuln.get('evidence', {}), default=str)[:500]}"
+                )
+            })
+
+        # Serve sections already answered for identical input from the
+        # disk cache; only the rest go to Ollama at all
+        cache_keys = {s["key"]: llm_cache.key_for(s["key"], s["instructions"]) for s in sections}
+        batched = {}
+        pending = []
+        for section in sections:
+            hit = self._llm_cache.get(cache_keys[section["key"]])
+            if hit is not None:
+                batched[section["key"]] = hit
+            else:
+                pending.append(section)
+
+        if pending:
+            try:
+                batched.update(self.ollama_client.generate_batched(pending))
+            except Exception:
+                pass
+
+        # Sections the batch missed are independent of each other, so
+        # retry them concurrently before the serial last-resort fallbacks
+        missing = {s["key"]: s["instructions"] for s in pending if s["key"] not in batched}
+        if missing:
+            try:
+                batched.update(self.ollama_client.generate_many(missing))
+            except Exception:
+                pass
+
+        for section in pending:
+            if section["key"] in batched:
+                self._llm_cache.put(cache_keys[section["key"]], batched[section["key"]])
+
         insights = {}
-        
+
         try:
-            # Executive summary
-            insights["executive_summary"] = self.ollama_client.generate_summary(analysis_data)
-            
-            if self.verbose:
-                console.print("   🔍 Analyzing vulnerability patterns...")
-            
-            # Vulnerability pattern analysis
-            if analysis_data["vulnerabilities"]:
-                insights["pattern_analysis"] = self.ollama_client.analyze_vulnerability_pattern(
-                    analysis_data["vulnerabilities"]
+            insights["executive_summary"] = (
+                batched.get("executive_summary")
+                or self.ollama_client.generate_summary(analysis_data)
+            )
+
+            if vulnerabilities:
+                insights["pattern_analysis"] = (
+                    batched.get("pattern_analysis")
+                    or self.ollama_client.analyze_vulnerability_pattern(vulnerabilities)
                 )
             else:
                 insights["pattern_analysis"] = "No vulnerabilities detected for pattern analysis."
-            
-            if self.verbose:
-                console.print("   💡 Generating security recommendations...")
-            
-            # Security recommendations
-            insights["recommendations"] = self.ollama_client.generate_security_recommendations({
-                "endpoints": analysis_data["endpoints"],
-                "technologies": analysis_data["stats"]["technologies"],
-                "findings": analysis_data["findings"]
-            })
-            
-            # Individual vulnerability explanations
-            if self.verbose:
-                console.print("   📝 Generating vulnerability explanations...")
-            
+
+            insights["recommendations"] = (
+                batched.get("recommendations")
+                or self.ollama_client.generate_security_recommendations({
+                    "endpoints": analysis_data["endpoints"],
+                    "technologies": stats["technologies"],
+                    "findings": analysis_data["findings"]
+                })
+            )
+
             insights["vulnerability_explanations"] = {}
-            for vuln in analysis_data["vulnerabilities"][:5]:  # Top 5 vulnerabilities
+            for vuln in top_vulns:
                 vuln_id = vuln.get("id", "unknown")
                 try:
-                    explanation = self.ollama_client.generate_remediation(vuln)
+                    explanation = (
+                        batched.get(f"vuln:{vuln_id}")
+                        or self.ollama_client.generate_remediation(vuln)
+                    )
                     insights["vulnerability_explanations"][vuln_id] = explanation
                 except Exception as e:
                     insights["vulnerability_explanations"][vuln_id] = f"AI explanation failed: {e}"
-            
+
         except Exception as e:
             raise Exception(f"🤖 AI analysis failed: {e}")
-        
+
         return insights
     
     def _prepare_report_context(self, target_info: Dict[str, Any], static_results: Dict[str, Any],
                                endpoints: List[Dict[str, Any]], test_results: List[Dict[str, Any]],
-                               ai_insights: Dict[str, Any]) -> Dict[str, Any]:
+                               ai_insights: Dict[str, Any], classified: Dict[str, Any],
+                               timestamp: str) -> Dict[str, Any]:
         """Prepare comprehensive report context."""
-        
-        # Categorize results
-        vulnerable_results = [r for r in test_results if r.get("status") == "vulnerable"]
-        secure_results = [r for r in test_results if r.get("status") == "secure"]
-        error_results = [r for r in test_results if r.get("status") == "error"]
-        
-        # Group vulnerabilities by type
-        vuln_by_type = {}
-        for result in vulnerable_results:
-            test_type = result.get("test_type", "unknown")
-            if test_type not in vuln_by_type:
-                vuln_by_type[test_type] = []
-            vuln_by_type[test_type].append(result)
-        
+        vulnerable_results = classified["vulnerable"]
+        secure_results = classified["secure"]
+        error_results = classified["errors"]
+        vuln_by_type = classified["by_type"]
+        severity = classified["severity"]
+
         # Calculate risk score (AI-enhanced)
         risk_score = self._calculate_ai_risk_score(vulnerable_results, ai_insights)
-        
+
+        # Pre-escape the highly repetitive columns once per unique value.
+        # Methods, severities and hint strings repeat across thousands of
+        # rows; escaping each occurrence under autoescape is O(rows) while
+        # this memoized pass is O(unique values). The results are Markup,
+        # so Jinja renders them without re-escaping. Render-only keys are
+        # underscore-prefixed and added after results are stored.
+        esc_cache: Dict[str, Markup] = {}
+
+        def esc(value: str) -> Markup:
+            return esc_cache.setdefault(value, escape(value))
+
+        endpoints_display = endpoints[:_ENDPOINT_DISPLAY_LIMIT]
+        for endpoint in endpoints_display:
+            endpoint["_method_html"] = esc(endpoint.get("method", ""))
+            endpoint["_hints_html"] = esc(", ".join(endpoint.get("security_hints", [])))
+
+        for vuln in vulnerable_results:
+            sev = vuln.get("severity", "low")
+            vuln["_severity_html"] = esc(sev)
+            vuln["_severity_upper_html"] = esc(sev.upper())
+            vuln["_test_type_html"] = esc(vuln.get("test_type", "unknown"))
+
         return {
             "target_info": target_info,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": timestamp,
             "ai_insights": ai_insights,
             "statistics": {
                 "total_endpoints": len(endpoints),
@@ -192,12 +399,16 @@ class ReportRenderer:
                 "error_count": len(error_results),
                 "risk_score": risk_score,
                 "severity_breakdown": {
-                    "high": len([r for r in vulnerable_results if r.get("severity") == "high"]),
-                    "medium": len([r for r in vulnerable_results if r.get("severity") == "medium"]),
-                    "low": len([r for r in vulnerable_results if r.get("severity") == "low"])
+                    "high": severity["high"],
+                    "medium": severity["medium"],
+                    "low": severity["low"]
                 }
             },
             "endpoints": endpoints,
+            # Templates render at most this many rows; on huge scans the
+            # per-row Jinja work (and report size) would otherwise be unbounded
+            "endpoints_display": endpoints_display,
+            "endpoints_truncated": max(0, len(endpoints) - _ENDPOINT_DISPLAY_LIMIT),
             "vulnerabilities": vulnerable_results,
             "vulnerabilities_by_type": vuln_by_type,
             "static_findings": static_results.get("security_findings", []),
@@ -221,13 +432,14 @@ class ReportRenderer:
         base_score = (high_count * 10) + (medium_count * 5) + (low_count * 1)
         
         # AI enhancement factor (based on pattern analysis)
-        ai_factor = 1.0
-        pattern_analysis = ai_insights.get("pattern_analysis", "").lower()
-        
-        if "systemic" in pattern_analysis or "widespread" in pattern_analysis:
+        pattern_analysis = ai_insights.get("pattern_analysis", "")
+
+        if _UP_FACTOR.search(pattern_analysis):
             ai_factor = 1.5
-        elif "isolated" in pattern_analysis or "limited" in pattern_analysis:
+        elif _DOWN_FACTOR.search(pattern_analysis):
             ai_factor = 0.8
+        else:
+            ai_factor = 1.0
         
         final_score = min(100, int(base_score * ai_factor))
         
@@ -248,287 +460,50 @@ class ReportRenderer:
     
     def _generate_markdown_report(self, context: Dict[str, Any]) -> Path:
         """Generate Markdown report."""
-        template = self.jinja_env.get_template("report.md.j2")
-        content = template.render(**context)
-        
+        template = _get_template(self.template_dir, "report.md.j2")
+
         report_file = self.run_dir / "report.md"
         with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+            stream = template.stream(**context)
+            stream.enable_buffering(size=16)
+            stream.dump(f)
         
-        if self.verbose:
-            console.print(f"   📄 Generated Markdown report: {report_file}")
+        self._log(f"   📄 Generated Markdown report: {report_file}")
         
         return report_file
     
     def _generate_html_report(self, context: Dict[str, Any]) -> Path:
         """Generate HTML report."""
-        template = self.jinja_env.get_template("report.html.j2")
-        content = template.render(**context)
-        
+        template = _get_template(self.template_dir, "report.html.j2")
+
         report_file = self.run_dir / "report.html"
         with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+            stream = template.stream(**context)
+            stream.enable_buffering(size=16)
+            stream.dump(f)
         
-        if self.verbose:
-            console.print(f"   🌐 Generated HTML report: {report_file}")
+        self._log(f"   🌐 Generated HTML report: {report_file}")
         
         return report_file
     
     def _ensure_templates_exist(self):
-        """Create report templates if they don't exist."""
-        
-        # Markdown template
-        md_template_path = self.template_dir / "report.md.j2"
-        if not md_template_path.exists():
-            self._create_markdown_template(md_template_path)
-        
-        # HTML template
-        html_template_path = self.template_dir / "report.html.j2"
-        if not html_template_path.exists():
-            self._create_html_template(html_template_path)
-    
-    def _create_markdown_template(self, template_path: Path):
-        """Create Markdown report template."""
-        template_content = '''# 🛡️ AI-Powered API Security Assessment Report
-
-**Target:** {{ target_info.base_url }}  
-**Repository:** {{ target_info.repo }}  
-**Generated:** {{ timestamp }}  
-**Risk Level:** {{ statistics.risk_score.level }} ({{ statistics.risk_score.score }}/100)
-
----
-
-## 🤖 AI Executive Summary
-
-{{ ai_insights.executive_summary }}
-
----
-
-## 📊 Assessment Overview
-
-| Metric | Count |
-|--------|-------|
-| **Total Endpoints** | {{ statistics.total_endpoints }} |
-| **Security Tests** | {{ statistics.total_tests }} |
-| **Vulnerabilities Found** | {{ statistics.vulnerable_count }} |
-| **High Severity** | {{ statistics.severity_breakdown.high }} |
-| **Medium Severity** | {{ statistics.severity_breakdown.medium }} |
-| **Low Severity** | {{ statistics.severity_breakdown.low }} |
-
-**Technologies Detected:** {{ technologies | join(", ") }}  
-**Discovery Methods:** {{ discovery_methods | join(", ") }}
-
----
-
-## 🔍 AI Vulnerability Pattern Analysis
-
-{{ ai_insights.pattern_analysis }}
-
----
-
-## ⚠️ Critical Vulnerabilities
-
-{% for vuln in vulnerabilities %}
-{% if vuln.severity == "high" %}
-### {{ vuln.test_name }}
-
-**Endpoint:** `{{ vuln.request_data.method }} {{ vuln.request_data.url }}`  
-**Severity:** {{ vuln.severity.upper() }}  
-**Status:** {{ vuln.status.upper() }}
-
-**AI Remediation:**
-{% if ai_insights.vulnerability_explanations[vuln.id] %}
-{{ ai_insights.vulnerability_explanations[vuln.id] }}
-{% else %}
-Standard remediation practices apply for {{ vuln.test_type }} vulnerabilities.
-{% endif %}
-
-**Evidence:**
-```json
-{{ vuln.evidence | tojson(indent=2) }}
-```
-
----
-{% endif %}
-{% endfor %}
-
-## 💡 AI Security Recommendations
-
-{{ ai_insights.recommendations }}
-
----
-
-## 📋 All Endpoints Analyzed
-
-| Method | Path | Auth | Security Hints |
-|--------|------|------|----------------|
-{% for endpoint in endpoints %}
-| {{ endpoint.method }} | `{{ endpoint.path }}` | {{ "✅" if endpoint.auth_detected else "❌" }} | {{ endpoint.security_hints | join(", ") }} |
-{% endfor %}
-
----
-
-## 🔧 Technical Details
-
-### Static Analysis Findings
-{% for finding in static_findings %}
-- **{{ finding.type }}** ({{ finding.severity }}): {{ finding.message }}
-{% endfor %}
-
-### Test Results Summary
-- **Vulnerable:** {{ statistics.vulnerable_count }}
-- **Secure:** {{ statistics.secure_count }}
-- **Errors:** {{ statistics.error_count }}
+        """Copy the packaged default templates into the template dir."""
+        defaults = importlib.resources.files("secagent.reporting.templates.defaults")
+        for name in ("report.md.j2", "report.html.j2"):
+            self._write_template_if_missing(
+                self.template_dir / name,
+                defaults.joinpath(name).read_text(encoding='utf-8')
+            )
 
----
+    @staticmethod
+    def _write_template_if_missing(template_path: Path, content: str) -> None:
+        """Create the template with O_EXCL so exists-then-write has no race
+        and no separate stat call."""
+        try:
+            fd = os.open(template_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            return
 
-*Report generated by AI-Powered Security Agent*
-'''
-        
-        with open(template_path, 'w', encoding='utf-8') as f:
-            f.write(template_content)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
     
-    def _create_html_template(self, template_path: Path):
-        """Create HTML report template."""
-        template_content = '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>🛡️ AI Security Assessment Report</title>
-    <style>
-        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 0; padding: 20px; background: #f5f5f5; }
-        .container { max-width: 1200px; margin: 0 auto; background: white; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }
-        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 10px 10px 0 0; }
-        .content { padding: 30px; }
-        .ai-section { background: #f8f9ff; border-left: 4px solid #667eea; padding: 20px; margin: 20px 0; border-radius: 5px; }
-        .risk-badge { display: inline-block; padding: 8px 16px; border-radius: 20px; font-weight: bold; margin: 10px 0; }
-        .risk-critical { background: #ff4757; color: white; }
-        .risk-high { background: #ff6b7a; color: white; }
-        .risk-medium { background: #ffa726; color: white; }
-        .risk-low { background: #66bb6a; color: white; }
-        .vuln-card { border: 1px solid #e0e0e0; border-radius: 8px; padding: 20px; margin: 15px 0; }
-        .vuln-high { border-left: 4px solid #ff4757; }
-        .vuln-medium { border-left: 4px solid #ffa726; }
-        .vuln-low { border-left: 4px solid #66bb6a; }
-        .stats-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px 0; }
-        .stat-card { background: #f8f9fa; padding: 20px; border-radius: 8px; text-align: center; }
-        .stat-number { font-size: 2em; font-weight: bold; color: #667eea; }
-        table { width: 100%; border-collapse: collapse; margin: 20px 0; }
-        th, td { padding: 12px; text-align: left; border-bottom: 1px solid #ddd; }
-        th { background: #f8f9fa; font-weight: 600; }
-        code { background: #f4f4f4; padding: 2px 6px; border-radius: 3px; font-family: 'Monaco', monospace; }
-        pre { background: #f4f4f4; padding: 15px; border-radius: 5px; overflow-x: auto; }
-        .emoji { font-size: 1.2em; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🛡️ AI-Powered API Security Assessment</h1>
-            <p><strong>Target:</strong> {{ target_info.base_url }}</p>
-            <p><strong>Repository:</strong> {{ target_info.repo }}</p>
-            <p><strong>Generated:</strong> {{ timestamp }}</p>
-            <div class="risk-badge risk-{{ statistics.risk_score.level.lower() }}">
-                Risk Level: {{ statistics.risk_score.level }} ({{ statistics.risk_score.score }}/100)
-            </div>
-        </div>
-        
-        <div class="content">
-            <div class="ai-section">
-                <h2>🤖 AI Executive Summary</h2>
-                <p>{{ ai_insights.executive_summary }}</p>
-            </div>
-            
-            <h2>📊 Assessment Overview</h2>
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-number">{{ statistics.total_endpoints }}</div>
-                    <div>Endpoints</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{{ statistics.vulnerable_count }}</div>
-                    <div>Vulnerabilities</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{{ statistics.severity_breakdown.high }}</div>
-                    <div>High Severity</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{{ statistics.total_tests }}</div>
-                    <div>Tests Run</div>
-                </div>
-            </div>
-            
-            <div class="ai-section">
-                <h2>🔍 AI Vulnerability Pattern Analysis</h2>
-                <p>{{ ai_insights.pattern_analysis }}</p>
-            </div>
-            
-            <h2>⚠️ Vulnerabilities Found</h2>
-            {% for vuln in vulnerabilities %}
-            <div class="vuln-card vuln-{{ vuln.severity }}">
-                <h3>{{ vuln.test_name }}</h3>
-                <p><strong>Endpoint:</strong> <code>{{ vuln.request_data.method }} {{ vuln.request_data.url }}</code></p>
-                <p><strong>Severity:</strong> {{ vuln.severity.upper() }}</p>
-                
-                {% if ai_insights.vulnerability_explanations[vuln.id] %}
-                <div style="background: #fff3cd; padding: 15px; border-radius: 5px; margin: 10px 0;">
-                    <strong>🤖 AI Remediation:</strong><br>
-                    {{ ai_insights.vulnerability_explanations[vuln.id] }}
-                </div>
-                {% endif %}
-                
-                <details>
-                    <summary>Technical Evidence</summary>
-                    <pre>{{ vuln.evidence | tojson(indent=2) }}</pre>
-                </details>
-            </div>
-            {% endfor %}
-            
-            <div class="ai-section">
-                <h2>💡 AI Security Recommendations</h2>
-                <p>{{ ai_insights.recommendations }}</p>
-            </div>
-            
-            <h2>📋 Endpoint Inventory</h2>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Method</th>
-                        <th>Path</th>
-                        <th>Auth</th>
-                        <th>Security Hints</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    {% for endpoint in endpoints %}
-                    <tr>
-                        <td><code>{{ endpoint.method }}</code></td>
-                        <td><code>{{ endpoint.path }}</code></td>
-                        <td>{{ "✅" if endpoint.auth_detected else "❌" }}</td>
-                        <td>{{ endpoint.security_hints | join(", ") }}</td>
-                    </tr>
-                    {% endfor %}
-                </tbody>
-            </table>
-            
-            <h2>🔧 Technical Details</h2>
-            <p><strong>Technologies:</strong> {{ technologies | join(", ") }}</p>
-            <p><strong>Discovery Methods:</strong> {{ discovery_methods | join(", ") }}</p>
-            
-            {% if static_findings %}
-            <h3>Static Analysis Findings</h3>
-            <ul>
-                {% for finding in static_findings %}
-                <li><strong>{{ finding.type }}</strong> ({{ finding.severity }}): {{ finding.message }}</li>
-                {% endfor %}
-            </ul>
-            {% endif %}
-        </div>
-    </div>
-</body>
-</html>'''
-        
-        with open(template_path, 'w', encoding='utf-8') as f:
-            f.write(template_content)
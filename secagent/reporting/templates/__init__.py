@@ -0,0 +1,3 @@
+"""
+Report templates (defaults shipped as package data).
+"""
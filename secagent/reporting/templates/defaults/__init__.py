@@ -0,0 +1,3 @@
+"""
+Default report templates copied into the working template dir on first run.
+"""
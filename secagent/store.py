@@ -4,12 +4,310 @@ SQLite database for storing endpoint and security data.
 
 import json
 import sqlite3
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from rich.console import Console
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ormsgpack
+except ImportError:
+    ormsgpack = None
+
 console = Console()
 
+if orjson is not None:
+    # orjson serializes several times faster than stdlib json; the store
+    # paths run it five times per row in both directions
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+
+    _loads = orjson.loads
+else:
+    _dumps = json.dumps
+    _loads = json.loads
+
+def _decode(value: Any) -> Any:
+    # BLOB columns come back as bytes (msgpack), TEXT as str (JSON), so a
+    # database written either way stays readable
+    if isinstance(value, bytes):
+        return ormsgpack.unpackb(value)
+    return _loads(value)
+
+if ormsgpack is not None:
+    # msgpack BLOBs are smaller on disk than JSON text and skip string
+    # decoding on both sides; the declared TEXT affinity does not coerce
+    # bytes, so existing schemas take the BLOBs as-is
+    _encode = ormsgpack.packb
+else:
+    _encode = _dumps
+
+def _endpoint_blobs(endpoint: Dict[str, Any], cache: Dict[int, tuple]) -> tuple:
+    """Encode an endpoint's structured columns, caching the result.
+
+    Iterative scans store the same endpoint dicts more than once; the
+    encoded blobs are memoized in a cache held by the database, keyed by
+    object identity, so re-stores skip re-serialization. The endpoint
+    itself is kept in the entry so a recycled id() can never alias a
+    different dict, and the dicts stay clean for downstream consumers
+    (reporting serializes them as JSON). Mutating an endpoint in place
+    between stores persists the originally encoded values.
+    """
+    entry = cache.get(id(endpoint))
+    if entry is not None and entry[0] is endpoint:
+        return entry[1]
+    blobs = (
+        _encode(endpoint.get('parameters', [])),
+        _encode(endpoint.get('id_parameters', [])),
+        _encode(endpoint.get('auth_requirements', [])),
+        _encode(endpoint.get('security_hints', [])),
+        _encode(endpoint.get('metadata', {}))
+    )
+    cache[id(endpoint)] = (endpoint, blobs)
+    return blobs
+
+# Scalar columns are pulled with a single C-level itemgetter call per row
+# instead of a chain of .get() lookups; missing keys are filled by merging
+# over the defaults dict first
+_EP_DEFAULTS = {
+    'id': None, 'method': None, 'path': None, 'path_template': None,
+    'source': None, 'source_file': None, 'auth_detected': False,
+}
+_EP_SCALARS = itemgetter('id', 'method', 'path', 'path_template',
+                         'source', 'source_file', 'auth_detected')
+
+_TR_DEFAULTS = {
+    'id': None, 'endpoint_id': None, 'test_type': None, 'test_name': None,
+    'status': None, 'severity': None, 'evidence': {}, 'request_data': {},
+    'response_data': {}, 'timing_ms': None,
+}
+_TR_GET = itemgetter('id', 'endpoint_id', 'test_type', 'test_name', 'status',
+                     'severity', 'evidence', 'request_data', 'response_data',
+                     'timing_ms')
+
+_FD_DEFAULTS = {
+    'type': None, 'severity': None, 'message': None, 'file_path': None,
+    'line_number': None, 'pattern': None, 'metadata': {},
+}
+_FD_GET = itemgetter('type', 'severity', 'message', 'file_path',
+                     'line_number', 'pattern', 'metadata')
+
+# Rows committed per transaction by the store_* methods. One giant
+# transaction for a very large store keeps the WAL growing and readers
+# waiting on the checkpoint; bounded batches keep both in check while
+# still amortizing the commit cost.
+_BATCH_ROWS = 10_000
+
+def _batched(iterable, n: int = _BATCH_ROWS):
+    it = iter(iterable)
+    while batch := list(islice(it, n)):
+        yield batch
+
+# INSERT statements defined once so SQLite parses each a single time and
+# reuses the prepared plan for every row in an executemany batch
+_SQL_INSERT_ENDPOINT = '''
+    INSERT OR REPLACE INTO endpoints (
+        id, method, path, path_template, source, source_file,
+        parameters, id_parameters, auth_requirements, auth_detected,
+        security_hints, metadata
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_TEST_RESULT = '''
+    INSERT INTO test_results (
+        id, endpoint_id, test_type, test_name, status, severity,
+        evidence, request_data, response_data, timing_ms
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_FINDING = '''
+    INSERT INTO security_findings (
+        type, severity, message, file_path, line_number, pattern, metadata
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+# get_endpoints supports three optional equality filters, i.e. eight
+# possible statements. Building them once keyed by a (method, source,
+# has_auth) presence mask means the exact same string object is passed to
+# SQLite every time, so its statement cache always hits.
+_ENDPOINT_FILTER_COLUMNS = ('method', 'source', 'has_auth')
+_ENDPOINT_FILTER_CONDITIONS = ('method = ?', 'source = ?', 'auth_detected = ?')
+
+def _build_endpoint_queries() -> Dict[int, str]:
+    queries = {}
+    for mask in range(8):
+        conditions = [
+            cond for bit, cond in enumerate(_ENDPOINT_FILTER_CONDITIONS)
+            if mask & (1 << bit)
+        ]
+        query = 'SELECT * FROM endpoints'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        queries[mask] = query + ' ORDER BY method, path_template'
+    return queries
+
+_SQL_SELECT_ENDPOINTS = _build_endpoint_queries()
+
+_SQL_SELECT_TEST_RESULTS = 'SELECT * FROM test_results ORDER BY created_at DESC'
+_SQL_SELECT_TEST_RESULTS_BY_ENDPOINT = (
+    'SELECT * FROM test_results WHERE endpoint_id = ? ORDER BY created_at DESC'
+)
+_SQL_SELECT_FINDINGS = (
+    'SELECT * FROM security_findings ORDER BY severity DESC, created_at DESC'
+)
+_SQL_SELECT_FINDINGS_BY_SEVERITY = (
+    'SELECT * FROM security_findings WHERE severity = ? '
+    'ORDER BY severity DESC, created_at DESC'
+)
+
+# All six summary aggregates in one statement: a discriminator column
+# plus generic slots (v for a group label, c1..c5 for counts), so the
+# dashboard query is a single prepared plan and one Python/SQLite
+# round-trip instead of six
+_SQL_SUMMARY_STATS = '''
+    SELECT 'endpoints' AS k, NULL AS v,
+           COUNT(*) AS c1,
+           COUNT(CASE WHEN auth_detected = 1 THEN 1 END) AS c2,
+           COUNT(CASE WHEN auth_detected = 0 THEN 1 END) AS c3,
+           NULL AS c4, NULL AS c5
+    FROM endpoints
+    UNION ALL
+    SELECT 'method', method, COUNT(*), NULL, NULL, NULL, NULL
+    FROM endpoints GROUP BY method
+    UNION ALL
+    SELECT 'source', source, COUNT(*), NULL, NULL, NULL, NULL
+    FROM endpoints GROUP BY source
+    UNION ALL
+    SELECT 'tests', NULL,
+           COUNT(*),
+           COUNT(CASE WHEN status = 'vulnerable' THEN 1 END),
+           COUNT(CASE WHEN status = 'secure' THEN 1 END),
+           COUNT(CASE WHEN status = 'inconclusive' THEN 1 END),
+           COUNT(CASE WHEN status = 'error' THEN 1 END)
+    FROM test_results
+    UNION ALL
+    SELECT 'severity', severity, COUNT(*), NULL, NULL, NULL, NULL
+    FROM test_results WHERE status = 'vulnerable' GROUP BY severity
+    UNION ALL
+    SELECT 'findings', NULL,
+           COUNT(*),
+           COUNT(CASE WHEN severity = 'high' THEN 1 END),
+           COUNT(CASE WHEN severity = 'medium' THEN 1 END),
+           COUNT(CASE WHEN severity = 'low' THEN 1 END),
+           NULL
+    FROM security_findings
+'''
+
+_SEVERITY_ORDER = {'high': 1, 'medium': 2, 'low': 3}
+
+_SQL_SELECT_VULNERABLE = '''
+    SELECT DISTINCT {projection}
+    FROM endpoints e
+    JOIN test_results tr ON e.id = tr.endpoint_id
+    WHERE tr.status = 'vulnerable'
+    ORDER BY 
+        CASE tr.severity 
+            WHEN 'high' THEN 1 
+            WHEN 'medium' THEN 2 
+            WHEN 'low' THEN 3 
+            ELSE 4 
+        END,
+        e.method, e.path_template
+'''
+
+# Columns in the vulnerable-endpoint join that live on test_results;
+# everything else resolves against endpoints
+_VULN_TR_COLUMNS = frozenset({'test_type', 'test_name', 'severity', 'evidence'})
+
+# Projected statements are cached per columns tuple so repeated calls
+# hand SQLite the same string object (statement-cache hit)
+_projection_cache: Dict[tuple, str] = {}
+
+class LazyJSONRow(dict):
+    """Row dict that decodes its structured columns on first access.
+
+    Callers usually touch only a couple of scalar columns per row, so
+    eagerly decoding five encoded blobs each is wasted work. Encoded
+    values are kept aside and decoded (then memoized into the dict) the
+    first time their key is read; iteration materializes everything so
+    the row still behaves like a plain dict.
+    """
+
+    __slots__ = ('_raw', '_defaults')
+
+    def __init__(self, row: sqlite3.Row, lazy: Dict[str, type]):
+        super().__init__()
+        raw = {}
+        for key in row.keys():
+            if key in lazy:
+                raw[key] = row[key]
+            else:
+                dict.__setitem__(self, key, row[key])
+        self._raw = raw
+        self._defaults = lazy
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return dict.__getitem__(self, key)
+        except KeyError:
+            raw = self._raw
+            if key in raw:
+                value = raw.pop(key)
+                decoded = _decode(value) if value else self._defaults[key]()
+                dict.__setitem__(self, key, decoded)
+                return decoded
+            raise
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key) or key in self._raw
+
+    def _materialize(self) -> None:
+        for key in list(self._raw):
+            self[key]
+
+    def __iter__(self):
+        self._materialize()
+        return dict.__iter__(self)
+
+    def __len__(self) -> int:
+        return dict.__len__(self) + len(self._raw)
+
+    def keys(self):
+        self._materialize()
+        return dict.keys(self)
+
+    def values(self):
+        self._materialize()
+        return dict.values(self)
+
+    def items(self):
+        self._materialize()
+        return dict.items(self)
+
+# Encoded columns per table and the default to use when a column is empty
+_ENDPOINT_LAZY_COLUMNS = {
+    'parameters': list,
+    'id_parameters': list,
+    'auth_requirements': list,
+    'security_hints': list,
+    'metadata': dict,
+}
+_VULN_LAZY_COLUMNS = {**_ENDPOINT_LAZY_COLUMNS, 'evidence': dict}
+_RESULT_LAZY_COLUMNS = {'evidence': dict, 'request_data': dict, 'response_data': dict}
+_FINDING_LAZY_COLUMNS = {'metadata': dict}
+
 class SecurityDatabase:
     """SQLite database for storing security analysis data."""
     
@@ -17,6 +315,22 @@ class SecurityDatabase:
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_database()
+        # One long-lived connection for the run (access is single-threaded):
+        # per-call sqlite3.connect() paid file-open plus rollback-journal
+        # fsyncs on every commit. WAL is the fastest journal mode for write
+        # workloads and synchronous=NORMAL is safe with it.
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                     cached_statements=512)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA temp_store=MEMORY')
+        self._conn.execute('PRAGMA cache_size=-65536')
+        # Encoded-column memo for store_endpoints; see _endpoint_blobs
+        self._endpoint_blob_cache: Dict[int, tuple] = {}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
     
     def _init_database(self) -> None:
         """Initialize database schema."""
@@ -36,7 +350,7 @@ class SecurityDatabase:
                     security_hints TEXT,  -- JSON
                     metadata TEXT,  -- JSON
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+                ) WITHOUT ROWID
             ''')
             
             conn.execute('''
@@ -53,7 +367,7 @@ class SecurityDatabase:
                     timing_ms INTEGER,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY (endpoint_id) REFERENCES endpoints (id)
-                )
+                ) WITHOUT ROWID
             ''')
             
             conn.execute('''
@@ -72,275 +386,220 @@ class SecurityDatabase:
             
             # Create indexes for better query performance
             conn.execute('CREATE INDEX IF NOT EXISTS idx_endpoints_method_path ON endpoints (method, path_template)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_endpoints_auth ON endpoints (auth_detected)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_test_results_endpoint ON test_results (endpoint_id)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_test_results_status ON test_results (status)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_security_findings_severity ON security_findings (severity)')
+            # Composite index covers the vulnerable-endpoint join and the
+            # severity GROUP BY without touching the table
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_test_results_status_sev ON test_results (status, severity, endpoint_id)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_findings_severity_created ON security_findings (severity, created_at DESC)')
     
     def store_endpoints(self, endpoints: List[Dict[str, Any]]) -> None:
         """Store normalized endpoints in the database."""
-        with sqlite3.connect(self.db_path) as conn:
+        blob_cache = self._endpoint_blob_cache
+
+        def rows():
             for endpoint in endpoints:
-                conn.execute('''
-                    INSERT OR REPLACE INTO endpoints (
-                        id, method, path, path_template, source, source_file,
-                        parameters, id_parameters, auth_requirements, auth_detected,
-                        security_hints, metadata
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    endpoint.get('id'),
-                    endpoint.get('method'),
-                    endpoint.get('path'),
-                    endpoint.get('path_template'),
-                    endpoint.get('source'),
-                    endpoint.get('source_file'),
-                    json.dumps(endpoint.get('parameters', [])),
-                    json.dumps(endpoint.get('id_parameters', [])),
-                    json.dumps(endpoint.get('auth_requirements', [])),
-                    endpoint.get('auth_detected', False),
-                    json.dumps(endpoint.get('security_hints', [])),
-                    json.dumps(endpoint.get('metadata', {}))
-                ))
-            
+                parameters, id_parameters, auth_requirements, hints, metadata = \
+                    _endpoint_blobs(endpoint, blob_cache)
+                *scalars, auth_detected = _EP_SCALARS({**_EP_DEFAULTS, **endpoint})
+                yield (
+                    *scalars,
+                    parameters,
+                    id_parameters,
+                    auth_requirements,
+                    auth_detected,
+                    hints,
+                    metadata
+                )
+        conn = self._conn
+        for batch in _batched(rows()):
+            conn.executemany(_SQL_INSERT_ENDPOINT, batch)
             conn.commit()
-    
+
     def store_test_results(self, results: List[Dict[str, Any]]) -> None:
         """Store test results in the database."""
-        with sqlite3.connect(self.db_path) as conn:
+        def rows():
             for result in results:
-                conn.execute('''
-                    INSERT INTO test_results (
-                        id, endpoint_id, test_type, test_name, status, severity,
-                        evidence, request_data, response_data, timing_ms
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    result.get('id'),
-                    result.get('endpoint_id'),
-                    result.get('test_type'),
-                    result.get('test_name'),
-                    result.get('status'),
-                    result.get('severity'),
-                    json.dumps(result.get('evidence', {})),
-                    json.dumps(result.get('request_data', {})),
-                    json.dumps(result.get('response_data', {})),
-                    result.get('timing_ms')
-                ))
-            
+                (*scalars, evidence, request_data, response_data,
+                 timing_ms) = _TR_GET({**_TR_DEFAULTS, **result})
+                yield (
+                    *scalars,
+                    _encode(evidence),
+                    _encode(request_data),
+                    _encode(response_data),
+                    timing_ms
+                )
+        conn = self._conn
+        for batch in _batched(rows()):
+            conn.executemany(_SQL_INSERT_TEST_RESULT, batch)
             conn.commit()
-    
+
     def store_security_findings(self, findings: List[Dict[str, Any]]) -> None:
         """Store static security findings in the database."""
-        with sqlite3.connect(self.db_path) as conn:
+        def rows():
             for finding in findings:
-                conn.execute('''
-                    INSERT INTO security_findings (
-                        type, severity, message, file_path, line_number, pattern, metadata
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    finding.get('type'),
-                    finding.get('severity'),
-                    finding.get('message'),
-                    finding.get('file_path'),
-                    finding.get('line_number'),
-                    finding.get('pattern'),
-                    json.dumps(finding.get('metadata', {}))
-                ))
-            
+                *scalars, metadata = _FD_GET({**_FD_DEFAULTS, **finding})
+                yield (*scalars, _encode(metadata))
+        conn = self._conn
+        for batch in _batched(rows()):
+            conn.executemany(_SQL_INSERT_FINDING, batch)
             conn.commit()
     
-    def get_endpoints(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Retrieve endpoints with optional filters."""
-        query = 'SELECT * FROM endpoints'
+    def get_endpoints(self, filters: Optional[Dict[str, Any]] = None,
+                      columns: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """Retrieve endpoints with optional filters.
+
+        Pass `columns` to narrow the projection: callers that only need a
+        few scalar fields skip reading the large encoded blobs entirely
+        and let SQLite answer from a covering index where one exists.
+        """
+        conn = self._conn
+        conn.row_factory = sqlite3.Row
+
+        # The common call is unfiltered and unprojected; skip straight to
+        # the precompiled statement without building mask or params
+        if not filters and columns is None:
+            cursor = conn.execute(_SQL_SELECT_ENDPOINTS[0])
+            return [
+                LazyJSONRow(row, _ENDPOINT_LAZY_COLUMNS)
+                for row in cursor.fetchall()
+            ]
+
+        mask = 0
         params = []
-        
         if filters:
-            conditions = []
-            if 'method' in filters:
-                conditions.append('method = ?')
-                params.append(filters['method'])
-            if 'source' in filters:
-                conditions.append('source = ?')
-                params.append(filters['source'])
-            if 'has_auth' in filters:
-                conditions.append('auth_detected = ?')
-                params.append(filters['has_auth'])
-            
-            if conditions:
-                query += ' WHERE ' + ' AND '.join(conditions)
-        
-        query += ' ORDER BY method, path_template'
-        
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(query, params)
-            
-            endpoints = []
-            for row in cursor.fetchall():
-                endpoint = dict(row)
-                # Parse JSON fields
-                endpoint['parameters'] = json.loads(endpoint['parameters'] or '[]')
-                endpoint['id_parameters'] = json.loads(endpoint['id_parameters'] or '[]')
-                endpoint['auth_requirements'] = json.loads(endpoint['auth_requirements'] or '[]')
-                endpoint['security_hints'] = json.loads(endpoint['security_hints'] or '[]')
-                endpoint['metadata'] = json.loads(endpoint['metadata'] or '{}')
-                endpoints.append(endpoint)
+            for bit, key in enumerate(_ENDPOINT_FILTER_COLUMNS):
+                if key in filters:
+                    mask |= 1 << bit
+                    params.append(filters[key])
+
+        if columns is None:
+            query = _SQL_SELECT_ENDPOINTS[mask]
+            lazy = _ENDPOINT_LAZY_COLUMNS
+        else:
+            columns = tuple(columns)
+            key = ('endpoints', columns, mask)
+            query = _projection_cache.get(key)
+            if query is None:
+                query = _SQL_SELECT_ENDPOINTS[mask].replace(
+                    'SELECT *', 'SELECT ' + ', '.join(columns), 1
+                )
+                _projection_cache[key] = query
+            lazy = {k: v for k, v in _ENDPOINT_LAZY_COLUMNS.items() if k in columns}
+
+        cursor = conn.execute(query, params)
             
-            return endpoints
+        # No decoding in the hot path: columns decode on first access
+        return [LazyJSONRow(row, lazy) for row in cursor.fetchall()]
     
     def get_test_results(self, endpoint_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Retrieve test results, optionally filtered by endpoint."""
-        query = 'SELECT * FROM test_results'
-        params = []
-        
         if endpoint_id:
-            query += ' WHERE endpoint_id = ?'
-            params.append(endpoint_id)
-        
-        query += ' ORDER BY created_at DESC'
-        
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(query, params)
-            
-            results = []
-            for row in cursor.fetchall():
-                result = dict(row)
-                # Parse JSON fields
-                result['evidence'] = json.loads(result['evidence'] or '{}')
-                result['request_data'] = json.loads(result['request_data'] or '{}')
-                result['response_data'] = json.loads(result['response_data'] or '{}')
-                results.append(result)
+            query, params = _SQL_SELECT_TEST_RESULTS_BY_ENDPOINT, (endpoint_id,)
+        else:
+            query, params = _SQL_SELECT_TEST_RESULTS, ()
+
+        conn = self._conn
+        conn.row_factory = sqlite3.Row
+        cursor = conn.execute(query, params)
             
-            return results
+        return [LazyJSONRow(row, _RESULT_LAZY_COLUMNS) for row in cursor.fetchall()]
     
     def get_security_findings(self, severity: Optional[str] = None) -> List[Dict[str, Any]]:
         """Retrieve security findings, optionally filtered by severity."""
-        query = 'SELECT * FROM security_findings'
-        params = []
-        
         if severity:
-            query += ' WHERE severity = ?'
-            params.append(severity)
-        
-        query += ' ORDER BY severity DESC, created_at DESC'
-        
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(query, params)
-            
-            findings = []
-            for row in cursor.fetchall():
-                finding = dict(row)
-                finding['metadata'] = json.loads(finding['metadata'] or '{}')
-                findings.append(finding)
+            query, params = _SQL_SELECT_FINDINGS_BY_SEVERITY, (severity,)
+        else:
+            query, params = _SQL_SELECT_FINDINGS, ()
+
+        conn = self._conn
+        conn.row_factory = sqlite3.Row
+        cursor = conn.execute(query, params)
             
-            return findings
+        return [LazyJSONRow(row, _FINDING_LAZY_COLUMNS) for row in cursor.fetchall()]
     
     def get_summary_stats(self) -> Dict[str, Any]:
         """Get summary statistics from the database."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            
-            # Endpoint stats
-            endpoint_stats = conn.execute('''
-                SELECT 
-                    COUNT(*) as total_endpoints,
-                    COUNT(CASE WHEN auth_detected = 1 THEN 1 END) as authenticated_endpoints,
-                    COUNT(CASE WHEN auth_detected = 0 THEN 1 END) as unauthenticated_endpoints
-                FROM endpoints
-            ''').fetchone()
-            
-            # Method distribution
-            method_stats = conn.execute('''
-                SELECT method, COUNT(*) as count
-                FROM endpoints
-                GROUP BY method
-                ORDER BY count DESC
-            ''').fetchall()
-            
-            # Source distribution
-            source_stats = conn.execute('''
-                SELECT source, COUNT(*) as count
-                FROM endpoints
-                GROUP BY source
-                ORDER BY count DESC
-            ''').fetchall()
-            
-            # Test result stats
-            test_stats = conn.execute('''
-                SELECT 
-                    COUNT(*) as total_tests,
-                    COUNT(CASE WHEN status = 'vulnerable' THEN 1 END) as vulnerable,
-                    COUNT(CASE WHEN status = 'secure' THEN 1 END) as secure,
-                    COUNT(CASE WHEN status = 'inconclusive' THEN 1 END) as inconclusive,
-                    COUNT(CASE WHEN status = 'error' THEN 1 END) as errors
-                FROM test_results
-            ''').fetchone()
-            
-            # Severity distribution
-            severity_stats = conn.execute('''
-                SELECT severity, COUNT(*) as count
-                FROM test_results
-                WHERE status = 'vulnerable'
-                GROUP BY severity
-                ORDER BY 
-                    CASE severity 
-                        WHEN 'high' THEN 1 
-                        WHEN 'medium' THEN 2 
-                        WHEN 'low' THEN 3 
-                        ELSE 4 
-                    END
-            ''').fetchall()
-            
-            # Security findings stats
-            findings_stats = conn.execute('''
-                SELECT 
-                    COUNT(*) as total_findings,
-                    COUNT(CASE WHEN severity = 'high' THEN 1 END) as high_severity,
-                    COUNT(CASE WHEN severity = 'medium' THEN 1 END) as medium_severity,
-                    COUNT(CASE WHEN severity = 'low' THEN 1 END) as low_severity
-                FROM security_findings
-            ''').fetchone()
-            
-            return {
-                'endpoints': dict(endpoint_stats) if endpoint_stats else {},
-                'methods': [dict(row) for row in method_stats],
-                'sources': [dict(row) for row in source_stats],
-                'tests': dict(test_stats) if test_stats else {},
-                'severity': [dict(row) for row in severity_stats],
-                'findings': dict(findings_stats) if findings_stats else {}
-            }
-    
-    def get_vulnerable_endpoints(self) -> List[Dict[str, Any]]:
-        """Get endpoints with vulnerable test results."""
-        query = '''
-            SELECT DISTINCT e.*, tr.test_type, tr.test_name, tr.severity, tr.evidence
-            FROM endpoints e
-            JOIN test_results tr ON e.id = tr.endpoint_id
-            WHERE tr.status = 'vulnerable'
-            ORDER BY 
-                CASE tr.severity 
-                    WHEN 'high' THEN 1 
-                    WHEN 'medium' THEN 2 
-                    WHEN 'low' THEN 3 
-                    ELSE 4 
-                END,
-                e.method, e.path_template
-        '''
-        
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(query)
-            
-            results = []
-            for row in cursor.fetchall():
-                result = dict(row)
-                # Parse JSON fields
-                result['parameters'] = json.loads(result['parameters'] or '[]')
-                result['id_parameters'] = json.loads(result['id_parameters'] or '[]')
-                result['auth_requirements'] = json.loads(result['auth_requirements'] or '[]')
-                result['security_hints'] = json.loads(result['security_hints'] or '[]')
-                result['metadata'] = json.loads(result['metadata'] or '{}')
-                result['evidence'] = json.loads(result['evidence'] or '{}')
-                results.append(result)
+        methods = []
+        sources = []
+        severity = []
+        stats = {
+            'endpoints': {},
+            'methods': methods,
+            'sources': sources,
+            'tests': {},
+            'severity': severity,
+            'findings': {}
+        }
+
+        for row in self._conn.execute(_SQL_SUMMARY_STATS):
+            k = row[0]
+            if k == 'endpoints':
+                stats['endpoints'] = {
+                    'total_endpoints': row[2],
+                    'authenticated_endpoints': row[3],
+                    'unauthenticated_endpoints': row[4]
+                }
+            elif k == 'method':
+                methods.append({'method': row[1], 'count': row[2]})
+            elif k == 'source':
+                sources.append({'source': row[1], 'count': row[2]})
+            elif k == 'tests':
+                stats['tests'] = {
+                    'total_tests': row[2],
+                    'vulnerable': row[3],
+                    'secure': row[4],
+                    'inconclusive': row[5],
+                    'errors': row[6]
+                }
+            elif k == 'severity':
+                severity.append({'severity': row[1], 'count': row[2]})
+            else:  # findings
+                stats['findings'] = {
+                    'total_findings': row[2],
+                    'high_severity': row[3],
+                    'medium_severity': row[4],
+                    'low_severity': row[5]
+                }
+
+        # A compound SELECT cannot ORDER BY its branches individually, so
+        # the (small) distributions are sorted here instead
+        methods.sort(key=lambda m: m['count'], reverse=True)
+        sources.sort(key=lambda m: m['count'], reverse=True)
+        severity.sort(key=lambda m: _SEVERITY_ORDER.get(m['severity'], 4))
+
+        return stats
+
+    def get_vulnerable_endpoints(self, columns: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """Get endpoints with vulnerable test results.
+
+        By default every joined column is returned; pass `columns` (plain
+        names, qualified automatically) to fetch just the fields needed
+        and leave the encoded blobs on disk.
+        """
+        if columns is None:
+            key = ('vulnerable', None)
+            query = _projection_cache.get(key)
+            if query is None:
+                query = _SQL_SELECT_VULNERABLE.format(
+                    projection='e.*, tr.test_type, tr.test_name, tr.severity, tr.evidence'
+                )
+                _projection_cache[key] = query
+            lazy = _VULN_LAZY_COLUMNS
+        else:
+            columns = tuple(columns)
+            key = ('vulnerable', columns)
+            query = _projection_cache.get(key)
+            if query is None:
+                projection = ', '.join(
+                    f"{'tr' if c in _VULN_TR_COLUMNS else 'e'}.{c}" for c in columns
+                )
+                query = _SQL_SELECT_VULNERABLE.format(projection=projection)
+                _projection_cache[key] = query
+            lazy = {k: v for k, v in _VULN_LAZY_COLUMNS.items() if k in columns}
+
+        conn = self._conn
+        conn.row_factory = sqlite3.Row
+        cursor = conn.execute(query)
             
-            return results
+        return [LazyJSONRow(row, lazy) for row in cursor.fetchall()]
@@ -0,0 +1,25 @@
+"""
+Helpers shared by the HTTP testers.
+"""
+
+from typing import Dict
+
+# Methods that carry a JSON body when one is supplied
+_BODY_METHODS = frozenset({'POST', 'PUT', 'PATCH'})
+
+# Header names whose values must never appear verbatim in stored results
+_SENSITIVE_HEADERS = frozenset({
+    'authorization', 'cookie', 'x-api-key', 'x-auth-token', 'x-jwt-token',
+})
+
+def _mask(value: str, keep: int) -> str:
+    if len(value) > keep * 2 + 3:
+        return value[:keep] + "..." + value[-keep:]
+    return "***"
+
+def mask_headers(headers: Dict[str, str], keep: int = 4) -> Dict[str, str]:
+    """Mask sensitive header values, keeping ``keep`` characters at each end."""
+    return {
+        key: _mask(value, keep) if key.casefold() in _SENSITIVE_HEADERS else value
+        for key, value in headers.items()
+    }
@@ -2,18 +2,185 @@
 BOLA (Broken Object Level Authorization) / IDOR testing.
 """
 
+import asyncio
 import re
 import uuid
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 import httpx
 
+from ._common import _BODY_METHODS, mask_headers
+
+# Status classes checked by the analyzers, interned once instead of a
+# fresh list per call
+_SUCCESS_CODES = frozenset({200, 201, 202})
+
+# Patterns compiled once at import: the inline re.* calls paid a cache
+# lookup (and occasionally a compile) on every mutation and every
+# similarity check
+_WORD_RE = re.compile(r'\w+')
+_NUMERIC_SEG_RE = re.compile(r'/(\d+)(?=/|$)')
+
+@lru_cache(maxsize=64)
+def _token_set(content: str) -> frozenset:
+    """Tokenize content into a set of lowercased words, memoized.
+
+    The same body (notably the baseline's) recurs across every mutation
+    of an endpoint, so tokenization is paid once per distinct body
+    instead of once per comparison.
+    """
+    return frozenset(_WORD_RE.findall(content.lower()))
+
+@lru_cache(maxsize=256)
+def _path_param_union(param_name: str) -> 're.Pattern':
+    """One alternation covering every template spelling of a parameter."""
+    escaped = re.escape(param_name)
+    return re.compile(rf'(?:\{{{escaped}\}}|<{escaped}>|:{escaped}(?=/|$))')
+
+# Path rewriting is a pure function of its inputs and fuzz-style scans
+# replay the same (path, parameter, value) triples, so the substitution
+# work is memoized and repeat mutations cost a dict lookup
+@lru_cache(maxsize=4096)
+def _substitute_path_segment(path: str, param_name: str, new_value: str) -> str:
+    # Find path parameters in any format ({id}, <id>, :id) in one scan
+    path, replaced = _path_param_union(param_name).subn(new_value, path)
+
+    # If no template found, try to replace numeric segments
+    if not replaced:
+        path = _NUMERIC_SEG_RE.sub(f'/{new_value}', path, count=1)
+
+    return path
+
+def _increment_segment(match: 're.Match') -> str:
+    try:
+        return f'/{int(match.group(1)) + 1}'
+    except ValueError:
+        return '/2'
+
+@lru_cache(maxsize=4096)
+def _increment_path(path: str) -> str:
+    # Increment first numeric path segment
+    return _NUMERIC_SEG_RE.sub(_increment_segment, path, count=1)
+
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# Building an SSL context is the expensive part of client construction;
+# one module-level context is shared by every client instance
+_SSL_CONTEXT = httpx.create_ssl_context()
+
+def _content_similarity(content1: str, content2: str) -> float:
+    """Calculate similarity between two content strings."""
+    if not content1 or not content2:
+        return 0.0
+
+    # Simple similarity based on common words
+    words1 = _token_set(content1)
+    words2 = _token_set(content2)
+
+    if not words1 or not words2:
+        return 0.0
+
+    intersection = len(words1 & words2)
+    union = len(words1 | words2)
+
+    return intersection / union if union > 0 else 0.0
+
+def _bola_success(evidence: Dict[str, Any], baseline: Dict[str, Any],
+                  test: Dict[str, Any]) -> Dict[str, Any]:
+    baseline_status = evidence["baseline_status"]
+    test_status = evidence["test_status"]
+
+    # Successful response to unauthorized request suggests BOLA
+    if test_status == 200 and baseline_status == 200:
+        # Check if content is similar (potential data leakage)
+        content_similarity = _content_similarity(
+            baseline.get("content", ""), test.get("content", "")
+        )
+
+        if content_similarity > 0.8:
+            evidence["content_similarity"] = content_similarity
+            evidence["vulnerability_type"] = "data_access"
+            return {"status": "vulnerable", "severity": "high", "evidence": evidence}
+        if content_similarity > 0.3:
+            evidence["content_similarity"] = content_similarity
+            evidence["vulnerability_type"] = "potential_data_leakage"
+            return {"status": "vulnerable", "severity": "medium", "evidence": evidence}
+
+    # Different successful status codes might indicate partial access
+    if baseline_status in _SUCCESS_CODES and test_status != baseline_status:
+        evidence["status_code_difference"] = True
+        return {"status": "vulnerable", "severity": "medium", "evidence": evidence}
+
+    return {"status": "inconclusive", "severity": "low", "evidence": evidence}
+
+def _bola_denied(evidence: Dict[str, Any], baseline: Dict[str, Any],
+                 test: Dict[str, Any]) -> Dict[str, Any]:
+    # Expected behavior: access denied
+    return {"status": "secure", "severity": "info", "evidence": evidence}
+
+def _bola_server_error(evidence: Dict[str, Any], baseline: Dict[str, Any],
+                       test: Dict[str, Any]) -> Dict[str, Any]:
+    evidence["server_error"] = True
+    return {"status": "inconclusive", "severity": "low", "evidence": evidence}
+
+def _bola_other(evidence: Dict[str, Any], baseline: Dict[str, Any],
+                test: Dict[str, Any]) -> Dict[str, Any]:
+    return {"status": "inconclusive", "severity": "low", "evidence": evidence}
+
+# Known status codes dispatch straight to their handler; only the 5xx
+# class still needs a range check
+_BOLA_HANDLERS = {
+    200: _bola_success,
+    201: _bola_success,
+    202: _bola_success,
+    401: _bola_denied,
+    403: _bola_denied,
+    404: _bola_denied,
+}
+
 class BOLATester:
     """Tests for Broken Object Level Authorization vulnerabilities."""
-    
+
+    def __init__(self):
+        # Every mutation of an endpoint shares the same baseline request;
+        # caching the response removes N-1 round-trips per endpoint
+        self._baseline_cache: Dict[tuple, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _new_client(timeout_ms: int) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout_ms / 1000.0),
+            follow_redirects=True,
+            http2=_HTTP2,
+            verify=_SSL_CONTEXT,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+
     def execute_test(self, test_case: Dict[str, Any], timeout_ms: int = 8000) -> Dict[str, Any]:
         """Execute BOLA test case."""
-        
+        return asyncio.run(self._execute_test(test_case, timeout_ms))
+
+    async def execute_tests(self, test_cases: List[Dict[str, Any]],
+                            timeout_ms: int = 8000,
+                            concurrency: int = 32) -> List[Dict[str, Any]]:
+        """Run many test cases concurrently over one pooled client."""
+        async with self._new_client(timeout_ms) as client:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def run_one(case: Dict[str, Any]) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._execute_test(case, timeout_ms, client)
+
+            return list(await asyncio.gather(*(run_one(c) for c in test_cases)))
+
+    async def _execute_test(self, test_case: Dict[str, Any], timeout_ms: int,
+                            client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+
         test_id = test_case.get('id')
         endpoint_id = test_case.get('endpoint_id')
         test_name = test_case.get('test_name')
@@ -21,22 +188,30 @@ class BOLATester:
         url = test_case.get('url')
         headers = test_case.get('headers', {})
         mutations = test_case.get('parameter_mutations', [])
-        
+
         try:
-            # Step 1: Make baseline request with original parameters
-            baseline_response = self._make_baseline_request(method, url, headers, timeout_ms)
-            
-            # Step 2: Apply parameter mutations and test
+            # Step 1: Apply parameter mutations
             mutated_url, mutated_headers, mutated_body = self._apply_mutations(
                 url, headers, {}, mutations
             )
-            
-            # Step 3: Make test request
-            test_response = self._make_request(
-                method, mutated_url, mutated_headers, mutated_body, timeout_ms
-            )
-            
-            # Step 4: Analyze responses for BOLA vulnerability
+
+            # Step 2: The baseline and mutated requests are independent, so
+            # they fly concurrently — one round-trip instead of two
+            if client is None:
+                async with self._new_client(timeout_ms) as own_client:
+                    baseline_response, test_response = await asyncio.gather(
+                        self._make_baseline_request(own_client, method, url, headers, timeout_ms),
+                        self._make_request(own_client, method, mutated_url,
+                                           mutated_headers, mutated_body, timeout_ms)
+                    )
+            else:
+                baseline_response, test_response = await asyncio.gather(
+                    self._make_baseline_request(client, method, url, headers, timeout_ms),
+                    self._make_request(client, method, mutated_url,
+                                       mutated_headers, mutated_body, timeout_ms)
+                )
+
+            # Step 3: Analyze responses for BOLA vulnerability
             analysis = self._analyze_bola_responses(baseline_response, test_response, mutations)
             
             return {
@@ -73,93 +248,116 @@ class BOLATester:
                 "response_data": {}
             }
     
-    def _make_baseline_request(self, method: str, url: str, headers: Dict[str, str], 
-                              timeout_ms: int) -> Dict[str, Any]:
-        """Make baseline request to understand normal behavior."""
+    async def _make_baseline_request(self, client: httpx.AsyncClient, method: str, url: str,
+                                     headers: Dict[str, str], timeout_ms: int) -> Dict[str, Any]:
+        """Make baseline request to understand normal behavior, cached per endpoint."""
+        key = (method, url, headers.get('Authorization', ''))
+        cached = self._baseline_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
-            return self._make_request(method, url, headers, {}, timeout_ms)
+            response = await self._make_request(client, method, url, headers, {}, timeout_ms)
         except Exception:
-            # If baseline fails, return empty response
+            # If baseline fails, return empty response (and don't cache the
+            # failure — a later mutation may find the target reachable)
             return {"status_code": 0, "content": "", "headers": {}}
-    
-    def _make_request(self, method: str, url: str, headers: Dict[str, str], 
-                     body: Dict[str, Any], timeout_ms: int) -> Dict[str, Any]:
+
+        self._baseline_cache[key] = response
+        return response
+
+    async def _make_request(self, client: httpx.AsyncClient, method: str, url: str,
+                            headers: Dict[str, str], body: Dict[str, Any],
+                            timeout_ms: int) -> Dict[str, Any]:
         """Make HTTP request and return structured response."""
-        
-        timeout_seconds = timeout_ms / 1000.0
-        
-        with httpx.Client(timeout=timeout_seconds, follow_redirects=True) as client:
-            
-            request_kwargs = {
-                "method": method,
-                "url": url,
-                "headers": headers
-            }
-            
-            if body and method.upper() in ["POST", "PUT", "PATCH"]:
-                request_kwargs["json"] = body
-            
-            response = client.request(**request_kwargs)
-            
-            # Extract response data
-            content = ""
-            try:
-                content = response.text[:10000]  # Limit content size
-            except Exception:
-                content = str(response.content[:10000])
-            
-            return {
-                "status_code": response.status_code,
-                "content": content,
-                "content_length": len(content),
-                "headers": dict(response.headers),
-                "response_time_ms": int(response.elapsed.total_seconds() * 1000)
-            }
+
+        request_kwargs = {
+            "method": method,
+            "url": url,
+            "headers": headers,
+            "timeout": timeout_ms / 1000.0
+        }
+
+        if body and method.upper() in _BODY_METHODS:
+            request_kwargs["json"] = body
+
+        # Stream the body and stop pulling once 10 KB are in hand; large
+        # responses never leave the server, saving bandwidth and time
+        chunks = []
+        received = 0
+        async with client.stream(**request_kwargs) as response:
+            async for chunk in response.aiter_bytes(chunk_size=4096):
+                chunks.append(chunk)
+                received += len(chunk)
+                if received >= 10000:
+                    break
+
+        # Decode only the kept slice; response.text would charset-detect and
+        # decode the whole body just to be truncated afterwards
+        raw = b''.join(chunks)[:10000]
+        content = raw.decode(response.encoding or 'utf-8', errors='replace')
+
+        return {
+            "status_code": response.status_code,
+            "content": content,
+            "content_length": response.num_bytes_downloaded,
+            "headers": dict(response.headers),
+            "response_time_ms": int(response.elapsed.total_seconds() * 1000)
+        }
     
-    def _apply_mutations(self, url: str, headers: Dict[str, str], body: Dict[str, Any], 
+    def _apply_mutations(self, url: str, headers: Dict[str, str], body: Dict[str, Any],
                         mutations: list) -> tuple:
-        """Apply parameter mutations to request."""
-        
-        mutated_url = url
-        mutated_headers = headers.copy()
-        mutated_body = body.copy()
-        
+        """Apply parameter mutations to request.
+
+        The URL is parsed once up front and serialized once at the end;
+        mutations edit the parsed pieces (path string, query dict) and the
+        private header/body copies in place, instead of re-parsing and
+        re-copying per mutation.
+        """
+        parsed = urlparse(url)
+        path = parsed.path
+        query_params = parse_qs(parsed.query, keep_blank_values=True)
+        query_mutated = False
+        mutated_headers = dict(headers)
+        mutated_body = dict(body)
+
         for mutation in mutations:
             param_name = mutation.get('name')
             param_location = mutation.get('in', mutation.get('location'))
             mutation_type = mutation.get('mutation_type')
             test_value = mutation.get('test_value')
-            
+
             if param_location == 'path':
-                mutated_url = self._mutate_path_param(mutated_url, param_name, mutation_type, test_value)
+                path = self._mutate_path_param(path, param_name, mutation_type, test_value)
             elif param_location == 'query':
-                mutated_url = self._mutate_query_param(mutated_url, param_name, mutation_type, test_value)
+                self._mutate_query_param(query_params, param_name, mutation_type, test_value)
+                query_mutated = True
             elif param_location == 'header':
-                mutated_headers = self._mutate_header_param(mutated_headers, param_name, mutation_type, test_value)
+                self._mutate_header_param(mutated_headers, param_name, mutation_type, test_value)
             elif param_location == 'body':
-                mutated_body = self._mutate_body_param(mutated_body, param_name, mutation_type, test_value)
-        
+                self._mutate_body_param(mutated_body, param_name, mutation_type, test_value)
+
+        query = urlencode(query_params, doseq=True) if query_mutated else parsed.query
+        mutated_url = urlunparse(parsed._replace(path=path, query=query))
         return mutated_url, mutated_headers, mutated_body
-    
-    def _mutate_path_param(self, url: str, param_name: str, mutation_type: str, test_value: Any) -> str:
-        """Mutate path parameter."""
-        
+
+    def _mutate_path_param(self, path: str, param_name: str, mutation_type: str, test_value: Any) -> str:
+        """Mutate path parameter, returning the new path."""
+
         if test_value is not None:
             # Direct replacement
-            return self._replace_path_segment(url, param_name, str(test_value))
-        
+            return self._replace_path_segment(path, param_name, str(test_value))
+
         if mutation_type == 'increment':
             # Try to find and increment numeric path segments
-            return self._increment_path_ids(url)
-        
-        return url
-    
-    def _mutate_query_param(self, url: str, param_name: str, mutation_type: str, test_value: Any) -> str:
-        """Mutate query parameter."""
-        
-        parsed = urlparse(url)
-        query_params = parse_qs(parsed.query, keep_blank_values=True)
-        
+            return self._increment_path_ids(path)
+
+        return path
+
+    def _mutate_query_param(self, query_params: Dict[str, list], param_name: str,
+                            mutation_type: str, test_value: Any) -> None:
+        """Mutate query parameter in the parsed query dict."""
+
         if test_value is not None:
             query_params[param_name] = [str(test_value)]
         elif mutation_type == 'increment':
@@ -169,79 +367,45 @@ class BOLATester:
                     query_params[param_name] = [str(current_val + 1)]
                 except (ValueError, IndexError):
                     query_params[param_name] = ['2']
-        
-        # Rebuild URL
-        new_query = urlencode(query_params, doseq=True)
-        return urlunparse(parsed._replace(query=new_query))
-    
-    def _mutate_header_param(self, headers: Dict[str, str], param_name: str, 
-                           mutation_type: str, test_value: Any) -> Dict[str, str]:
-        """Mutate header parameter."""
-        mutated = headers.copy()
-        
+
+    def _mutate_header_param(self, headers: Dict[str, str], param_name: str,
+                           mutation_type: str, test_value: Any) -> None:
+        """Mutate header parameter in place."""
+
         if test_value is not None:
-            mutated[param_name] = str(test_value)
-        
-        return mutated
-    
-    def _mutate_body_param(self, body: Dict[str, Any], param_name: str, 
-                          mutation_type: str, test_value: Any) -> Dict[str, Any]:
-        """Mutate body parameter."""
-        mutated = body.copy()
-        
+            headers[param_name] = str(test_value)
+
+    def _mutate_body_param(self, body: Dict[str, Any], param_name: str,
+                          mutation_type: str, test_value: Any) -> None:
+        """Mutate body parameter in place."""
+
         if test_value is not None:
-            mutated[param_name] = test_value
+            body[param_name] = test_value
         elif mutation_type == 'increment':
-            if param_name in mutated:
+            if param_name in body:
                 try:
-                    current_val = int(mutated[param_name])
-                    mutated[param_name] = current_val + 1
+                    current_val = int(body[param_name])
+                    body[param_name] = current_val + 1
                 except (ValueError, TypeError):
-                    mutated[param_name] = 2
-        
-        return mutated
+                    body[param_name] = 2
     
     def _replace_path_segment(self, url: str, param_name: str, new_value: str) -> str:
         """Replace path segment with new value."""
-        
-        # Try to find path parameters in various formats
-        patterns = [
-            (r'\{' + param_name + r'\}', new_value),  # {id}
-            (r'<' + param_name + r'>', new_value),     # <id>
-            (r':' + param_name, new_value),            # :id
-        ]
-        
-        for pattern, replacement in patterns:
-            url = re.sub(pattern, replacement, url)
-        
-        # If no template found, try to replace numeric segments
-        if not any(p[0] in url for p, _ in patterns):
-            url = re.sub(r'/\d+(?=/|$)', f'/{new_value}', url, count=1)
-        
-        return url
-    
+        return _substitute_path_segment(url, param_name, new_value)
+
     def _increment_path_ids(self, url: str) -> str:
         """Increment numeric IDs in path."""
-        
-        def increment_match(match):
-            try:
-                current_id = int(match.group(1))
-                return f'/{current_id + 1}'
-            except ValueError:
-                return f'/2'
-        
-        # Increment first numeric path segment
-        return re.sub(r'/(\d+)(?=/|$)', increment_match, url, count=1)
+        return _increment_path(url)
     
-    def _analyze_bola_responses(self, baseline: Dict[str, Any], test: Dict[str, Any], 
+    def _analyze_bola_responses(self, baseline: Dict[str, Any], test: Dict[str, Any],
                                mutations: list) -> Dict[str, Any]:
         """Analyze responses to detect BOLA vulnerability."""
-        
+
         baseline_status = baseline.get("status_code", 0)
         test_status = test.get("status_code", 0)
         baseline_content = baseline.get("content", "")
         test_content = test.get("content", "")
-        
+
         evidence = {
             "baseline_status": baseline_status,
             "test_status": test_status,
@@ -249,84 +413,15 @@ class BOLATester:
             "test_content_length": len(test_content),
             "mutations_applied": mutations
         }
-        
-        # Analysis logic
+
         if test_status == 0:
             return {"status": "error", "severity": "info", "evidence": evidence}
-        
-        # Successful response to unauthorized request suggests BOLA
-        if test_status == 200 and baseline_status == 200:
-            # Check if content is similar (potential data leakage)
-            content_similarity = self._calculate_content_similarity(baseline_content, test_content)
-            
-            if content_similarity > 0.8:
-                evidence["content_similarity"] = content_similarity
-                evidence["vulnerability_type"] = "data_access"
-                return {
-                    "status": "vulnerable",
-                    "severity": "high",
-                    "evidence": evidence
-                }
-            elif content_similarity > 0.3:
-                evidence["content_similarity"] = content_similarity
-                evidence["vulnerability_type"] = "potential_data_leakage"
-                return {
-                    "status": "vulnerable",
-                    "severity": "medium",
-                    "evidence": evidence
-                }
-        
-        # Different successful status codes might indicate partial access
-        if test_status in [200, 201, 202] and baseline_status in [200, 201, 202]:
-            if test_status != baseline_status:
-                evidence["status_code_difference"] = True
-                return {
-                    "status": "vulnerable",
-                    "severity": "medium",
-                    "evidence": evidence
-                }
-        
-        # Expected behavior: access denied
-        if test_status in [401, 403, 404]:
-            return {"status": "secure", "severity": "info", "evidence": evidence}
-        
-        # Unexpected responses
-        if test_status >= 500:
-            evidence["server_error"] = True
-            return {"status": "inconclusive", "severity": "low", "evidence": evidence}
-        
-        # Default: inconclusive
-        return {"status": "inconclusive", "severity": "low", "evidence": evidence}
-    
-    def _calculate_content_similarity(self, content1: str, content2: str) -> float:
-        """Calculate similarity between two content strings."""
-        if not content1 or not content2:
-            return 0.0
-        
-        # Simple similarity based on common words
-        words1 = set(re.findall(r'\w+', content1.lower()))
-        words2 = set(re.findall(r'\w+', content2.lower()))
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
-        
-        return intersection / union if union > 0 else 0.0
+
+        handler = _BOLA_HANDLERS.get(test_status)
+        if handler is None:
+            handler = _bola_server_error if test_status >= 500 else _bola_other
+        return handler(evidence, baseline, test)
     
     def _mask_sensitive_headers(self, headers: Dict[str, str]) -> Dict[str, str]:
         """Mask sensitive information in headers."""
-        masked = {}
-        sensitive_headers = ['authorization', 'cookie', 'x-api-key', 'x-auth-token']
-        
-        for key, value in headers.items():
-            if key.lower() in sensitive_headers:
-                if len(value) > 10:
-                    masked[key] = value[:4] + "..." + value[-4:]
-                else:
-                    masked[key] = "***"
-            else:
-                masked[key] = value
-        
-        return masked
+        return mask_headers(headers)
@@ -2,18 +2,162 @@
 JWT manipulation testing.
 """
 
-import base64
+import asyncio
+import binascii
 import json
 import re
-from typing import Dict, Any, Optional
+import string
+from typing import Dict, Any, List, Optional
 import httpx
 
+from ._common import _BODY_METHODS, mask_headers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+def _compile(pattern: str, flags: int = 0):
+    """Compile with google-re2's linear-time engine when installed."""
+    if re2 is not None:
+        try:
+            return re2.compile(pattern, flags)
+        except re2.error:
+            pass
+    return re.compile(pattern, flags)
+
+if orjson is not None:
+    # orjson (de)serializes several times faster and already emits compact
+    # JSON, matching the separators the stdlib path sets explicitly
+    _json_loads = orjson.loads
+    _json_dumps_bytes = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps_bytes(data: Any) -> bytes:
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+# base64url <-> standard alphabet, translated at byte level: the
+# base64.urlsafe_* helpers re-translate through str machinery per call
+_B64URL_DECODE_TR = bytes.maketrans(b'-_', b'+/')
+_B64URL_ENCODE_TR = bytes.maketrans(b'+/', b'-_')
+
+_B64URL_CHARS = frozenset(string.ascii_letters + string.digits + '-_')
+
+# JWT-bearing cookie parameters, compiled once at import
+_JWT_COOKIE_RE = re.compile(r'(?:jwt|token|auth)=([^;]+)', re.IGNORECASE)
+
+# Privilege indicators as a single alternation, so each response body is
+# scanned in one pass instead of six
+_PRIV_RE = _compile(
+    r'"role"\s*:\s*"admin"'
+    r'|"admin"\s*:\s*true'
+    r'|"is_admin"\s*:\s*true'
+    r'|"permissions"\s*:\s*\[[^\]]*"admin"'
+    r'|admin.*dashboard'
+    r'|administrative.*access',
+    re.IGNORECASE
+)
+
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# Building an SSL context is the expensive part of client construction;
+# one module-level context is shared by every client instance
+_SSL_CONTEXT = httpx.create_ssl_context()
+
+def _jwt_success(evidence: Dict[str, Any], test_content: str,
+                 mutations: list) -> Dict[str, Any]:
+    # Successful response with manipulated JWT suggests vulnerability
+    mutation_type = mutations[0].get('type') if mutations else 'unknown'
+
+    if mutation_type == 'algorithm_none':
+        evidence["vulnerability_type"] = "jwt_algorithm_confusion"
+        evidence["accepts_unsigned_jwt"] = True
+        return {"status": "vulnerable", "severity": "high", "evidence": evidence}
+
+    if mutation_type == 'claim_manipulation':
+        # Check if we got elevated privileges
+        if _PRIV_RE.search(test_content) is not None:
+            evidence["vulnerability_type"] = "jwt_privilege_escalation"
+            evidence["elevated_privileges_detected"] = True
+            return {"status": "vulnerable", "severity": "high", "evidence": evidence}
+
+        evidence["vulnerability_type"] = "jwt_claim_manipulation"
+        evidence["accepts_modified_claims"] = True
+        return {"status": "vulnerable", "severity": "medium", "evidence": evidence}
+
+    # A 200 without a recognized mutation proves nothing by itself
+    evidence["unexpected_response"] = True
+    return {"status": "inconclusive", "severity": "low", "evidence": evidence}
+
+def _jwt_denied(evidence: Dict[str, Any], test_content: str,
+                mutations: list) -> Dict[str, Any]:
+    # Expected behavior: JWT validation should fail
+    evidence["jwt_properly_validated"] = True
+    return {"status": "secure", "severity": "info", "evidence": evidence}
+
+def _jwt_server_error(evidence: Dict[str, Any], test_content: str,
+                      mutations: list) -> Dict[str, Any]:
+    # Server errors might indicate JWT parsing issues
+    evidence["server_error"] = True
+    evidence["potential_jwt_parsing_error"] = True
+    return {"status": "inconclusive", "severity": "low", "evidence": evidence}
+
+def _jwt_other(evidence: Dict[str, Any], test_content: str,
+               mutations: list) -> Dict[str, Any]:
+    evidence["unexpected_response"] = True
+    return {"status": "inconclusive", "severity": "low", "evidence": evidence}
+
+# Known status codes dispatch straight to their handler; only the 5xx
+# class still needs a range check
+_JWT_HANDLERS = {
+    200: _jwt_success,
+    401: _jwt_denied,
+    403: _jwt_denied,
+}
+
 class JWTManipulationTester:
     """Tests for JWT manipulation vulnerabilities."""
-    
+
+    @staticmethod
+    def _new_client(timeout_ms: int) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout_ms / 1000.0),
+            follow_redirects=True,
+            http2=_HTTP2,
+            verify=_SSL_CONTEXT,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+
     def execute_test(self, test_case: Dict[str, Any], timeout_ms: int = 8000) -> Dict[str, Any]:
         """Execute JWT manipulation test case."""
-        
+        return asyncio.run(self._execute_test(test_case, timeout_ms))
+
+    async def execute_tests(self, test_cases: List[Dict[str, Any]],
+                            timeout_ms: int = 8000,
+                            concurrency: int = 32) -> List[Dict[str, Any]]:
+        """Run many test cases concurrently over one pooled client."""
+        async with self._new_client(timeout_ms) as client:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def run_one(case: Dict[str, Any]) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._execute_test(case, timeout_ms, client)
+
+            return list(await asyncio.gather(*(run_one(c) for c in test_cases)))
+
+    async def _execute_test(self, test_case: Dict[str, Any], timeout_ms: int,
+                            client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+
         test_id = test_case.get('id')
         endpoint_id = test_case.get('endpoint_id')
         test_name = test_case.get('test_name')
@@ -38,16 +182,25 @@ class JWTManipulationTester:
                     "response_data": {}
                 }
             
-            # Step 2: Make baseline request with original JWT
-            baseline_response = self._make_request(method, url, headers, {}, timeout_ms)
-            
-            # Step 3: Apply JWT mutations
+            # Step 2: Apply JWT mutations
             mutated_headers = self._apply_jwt_mutations(headers, original_jwt, jwt_mutations)
-            
-            # Step 4: Make test request with manipulated JWT
-            test_response = self._make_request(method, url, mutated_headers, {}, timeout_ms)
-            
-            # Step 5: Analyze responses for JWT vulnerabilities
+
+            # Step 3: The baseline (original JWT) and test (manipulated JWT)
+            # requests are independent, so they fly concurrently — one
+            # round-trip instead of two
+            if client is None:
+                async with self._new_client(timeout_ms) as own_client:
+                    baseline_response, test_response = await asyncio.gather(
+                        self._make_request(own_client, method, url, headers, {}, timeout_ms),
+                        self._make_request(own_client, method, url, mutated_headers, {}, timeout_ms)
+                    )
+            else:
+                baseline_response, test_response = await asyncio.gather(
+                    self._make_request(client, method, url, headers, {}, timeout_ms),
+                    self._make_request(client, method, url, mutated_headers, {}, timeout_ms)
+                )
+
+            # Step 4: Analyze responses for JWT vulnerabilities
             analysis = self._analyze_jwt_responses(
                 baseline_response, test_response, original_jwt, jwt_mutations
             )
@@ -105,7 +258,7 @@ class JWTManipulationTester:
         
         # Check cookies (simplified - would need proper cookie parsing)
         cookie_header = headers.get('Cookie', '')
-        jwt_match = re.search(r'(?:jwt|token|auth)=([^;]+)', cookie_header, re.IGNORECASE)
+        jwt_match = _JWT_COOKIE_RE.search(cookie_header)
         if jwt_match:
             token = jwt_match.group(1)
             if self._is_jwt(token):
@@ -117,9 +270,24 @@ class JWTManipulationTester:
         """Check if a string looks like a JWT token."""
         if not token:
             return False
-        
-        parts = token.split('.')
-        return len(parts) >= 2  # JWT has at least header.payload (signature optional)
+
+        parts = token.split('.', 2)
+        if len(parts) < 2:  # JWT has at least header.payload (signature optional)
+            return False
+
+        # Cheap alphabet check before paying for base64+JSON work: cookie
+        # values with a dot (URLs, session blobs) bail out here
+        header = parts[0]
+        if not header or not _B64URL_CHARS.issuperset(header[:128]):
+            return False
+
+        # A real JWT header decodes to a JSON object declaring its algorithm
+        try:
+            raw = header.encode('ascii').translate(_B64URL_DECODE_TR)
+            decoded = binascii.a2b_base64(raw + b'=' * (-len(raw) & 3))
+        except (binascii.Error, UnicodeEncodeError):
+            return False
+        return decoded[:1] == b'{' and b'"alg"' in decoded[:64]
     
     def _apply_jwt_mutations(self, headers: Dict[str, str], original_jwt: str, 
                            mutations: list) -> Dict[str, str]:
@@ -205,17 +373,11 @@ class JWTManipulationTester:
         """Decode JWT part (header or payload)."""
         
         try:
-            # Add padding if needed
-            padding = 4 - (len(part) % 4)
-            if padding != 4:
-                part += '=' * padding
-            
-            # Decode base64
-            decoded_bytes = base64.urlsafe_b64decode(part)
-            
-            # Parse JSON
-            return json.loads(decoded_bytes.decode('utf-8'))
-            
+            # Translate to the standard alphabet, pad, decode, parse
+            raw = part.encode('ascii').translate(_B64URL_DECODE_TR)
+            raw += b'=' * (-len(raw) & 3)
+            return _json_loads(binascii.a2b_base64(raw))
+
         except Exception:
             return None
     
@@ -223,14 +385,9 @@ class JWTManipulationTester:
         """Encode JWT part (header or payload)."""
         
         try:
-            # Convert to JSON
-            json_str = json.dumps(data, separators=(',', ':'))
-            
-            # Encode to base64
-            encoded_bytes = base64.urlsafe_b64encode(json_str.encode('utf-8'))
-            
-            # Remove padding
-            return encoded_bytes.decode('utf-8').rstrip('=')
+            # Convert to compact JSON, encode, translate to base64url, unpad
+            encoded = binascii.b2a_base64(_json_dumps_bytes(data), newline=False)
+            return encoded.translate(_B64URL_ENCODE_TR).rstrip(b'=').decode('ascii')
             
         except Exception:
             return ""
@@ -254,39 +411,44 @@ class JWTManipulationTester:
         
         return mutated
     
-    def _make_request(self, method: str, url: str, headers: Dict[str, str], 
-                     body: Dict[str, Any], timeout_ms: int) -> Dict[str, Any]:
+    async def _make_request(self, client: httpx.AsyncClient, method: str, url: str,
+                            headers: Dict[str, str], body: Dict[str, Any],
+                            timeout_ms: int) -> Dict[str, Any]:
         """Make HTTP request and return structured response."""
-        
-        timeout_seconds = timeout_ms / 1000.0
-        
-        with httpx.Client(timeout=timeout_seconds, follow_redirects=True) as client:
-            
-            request_kwargs = {
-                "method": method,
-                "url": url,
-                "headers": headers
-            }
-            
-            if body and method.upper() in ["POST", "PUT", "PATCH"]:
-                request_kwargs["json"] = body
-            
-            response = client.request(**request_kwargs)
-            
-            # Extract response data
-            content = ""
-            try:
-                content = response.text[:10000]  # Limit content size
-            except Exception:
-                content = str(response.content[:10000])
-            
-            return {
-                "status_code": response.status_code,
-                "content": content,
-                "content_length": len(content),
-                "headers": dict(response.headers),
-                "response_time_ms": int(response.elapsed.total_seconds() * 1000)
-            }
+
+        request_kwargs = {
+            "method": method,
+            "url": url,
+            "headers": headers,
+            "timeout": timeout_ms / 1000.0
+        }
+
+        if body and method.upper() in _BODY_METHODS:
+            request_kwargs["json"] = body
+
+        # Stream the body and stop pulling once 10 KB are in hand; large
+        # responses never leave the server, saving bandwidth and time
+        chunks = []
+        received = 0
+        async with client.stream(**request_kwargs) as response:
+            async for chunk in response.aiter_bytes(chunk_size=4096):
+                chunks.append(chunk)
+                received += len(chunk)
+                if received >= 10000:
+                    break
+
+        # Decode only the kept slice; response.text would charset-detect and
+        # decode the whole body just to be truncated afterwards
+        raw = b''.join(chunks)[:10000]
+        content = raw.decode(response.encoding or 'utf-8', errors='replace')
+
+        return {
+            "status_code": response.status_code,
+            "content": content,
+            "content_length": response.num_bytes_downloaded,
+            "headers": dict(response.headers),
+            "response_time_ms": int(response.elapsed.total_seconds() * 1000)
+        }
     
     def _analyze_jwt_responses(self, baseline: Dict[str, Any], test: Dict[str, Any], 
                               original_jwt: str, mutations: list) -> Dict[str, Any]:
@@ -306,82 +468,14 @@ class JWTManipulationTester:
             "jwt_parts": len(original_jwt.split('.'))
         }
         
-        # Analysis logic
         if test_status == 0:
             return {"status": "error", "severity": "info", "evidence": evidence}
-        
-        # Successful response with manipulated JWT suggests vulnerability
-        if test_status == 200:
-            mutation_type = mutations[0].get('type') if mutations else 'unknown'
-            
-            if mutation_type == 'algorithm_none':
-                evidence["vulnerability_type"] = "jwt_algorithm_confusion"
-                evidence["accepts_unsigned_jwt"] = True
-                return {
-                    "status": "vulnerable",
-                    "severity": "high",
-                    "evidence": evidence
-                }
-            
-            elif mutation_type == 'claim_manipulation':
-                # Check if we got elevated privileges
-                privilege_indicators = [
-                    r'"role"\s*:\s*"admin"',
-                    r'"admin"\s*:\s*true',
-                    r'"is_admin"\s*:\s*true',
-                    r'"permissions"\s*:\s*\[[^\]]*"admin"',
-                    r'admin.*dashboard',
-                    r'administrative.*access'
-                ]
-                
-                has_elevated_access = any(re.search(pattern, test_content, re.IGNORECASE) 
-                                        for pattern in privilege_indicators)
-                
-                if has_elevated_access:
-                    evidence["vulnerability_type"] = "jwt_privilege_escalation"
-                    evidence["elevated_privileges_detected"] = True
-                    return {
-                        "status": "vulnerable",
-                        "severity": "high",
-                        "evidence": evidence
-                    }
-                else:
-                    evidence["vulnerability_type"] = "jwt_claim_manipulation"
-                    evidence["accepts_modified_claims"] = True
-                    return {
-                        "status": "vulnerable",
-                        "severity": "medium",
-                        "evidence": evidence
-                    }
-        
-        # Expected behavior: JWT validation should fail
-        elif test_status in [401, 403]:
-            evidence["jwt_properly_validated"] = True
-            return {"status": "secure", "severity": "info", "evidence": evidence}
-        
-        # Server errors might indicate JWT parsing issues
-        elif test_status >= 500:
-            evidence["server_error"] = True
-            evidence["potential_jwt_parsing_error"] = True
-            return {"status": "inconclusive", "severity": "low", "evidence": evidence}
-        
-        # Other responses
-        else:
-            evidence["unexpected_response"] = True
-            return {"status": "inconclusive", "severity": "low", "evidence": evidence}
+
+        handler = _JWT_HANDLERS.get(test_status)
+        if handler is None:
+            handler = _jwt_server_error if test_status >= 500 else _jwt_other
+        return handler(evidence, test_content, mutations)
     
     def _mask_sensitive_headers(self, headers: Dict[str, str]) -> Dict[str, str]:
         """Mask sensitive information in headers."""
-        masked = {}
-        sensitive_headers = ['authorization', 'cookie', 'x-api-key', 'x-auth-token', 'x-jwt-token']
-        
-        for key, value in headers.items():
-            if key.lower() in sensitive_headers:
-                if len(value) > 20:
-                    masked[key] = value[:8] + "..." + value[-8:]
-                else:
-                    masked[key] = "***"
-            else:
-                masked[key] = value
-        
-        return masked
+        return mask_headers(headers, keep=8)